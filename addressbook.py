@@ -1,10 +1,15 @@
+import calendar
+import os
 import pickle
 import re
+import sys
 from collections import UserDict
+from collections.abc import Callable
+from itertools import islice
 from datetime import datetime, timedelta
 from typing import Optional
 
-from email_validator import EmailNotValidError, validate_email
+from indexes import BirthdayIndex, FuzzyIndex, KeyIndex, PrefixIndex, TrigramIndex
 
 class RangeFormatError(Exception):
     def __init__(self, message):
@@ -26,15 +31,45 @@ class EmailFormatError(Exception):
     pass
 
 
+class PhoneExistsError(Exception):
+    pass
+
+
+class EmailExistsError(Exception):
+    pass
+
+
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
+    @classmethod
+    def trusted(cls, value) -> "Field":
+        """
+        Creates a field from an already validated and normalized value
+        """
+        field = cls.__new__(cls)
+        field.value = value
+        return field
+
+    def __getstate__(self):
+        return {"value": self.value}
+
+    def __setstate__(self, state):
+        # files written before fields had slots store (dict, None) state
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        self.value = state["value"]
+
     def __str__(self):
         return str(self.value)
 
 
 class Name(Field):
+    __slots__ = ()
+
     def __init__(self, name: str):
         if name:
             super().__init__(name.strip().capitalize())
@@ -43,12 +78,18 @@ class Name(Field):
 
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, phone: str):
         if self.validate_phone(phone):
             super().__init__(phone)
         else:
             raise PhoneFormatError(f"[!]Wrong phone format {phone}")
 
+    @staticmethod
+    def normalize(value: str) -> str:
+        return re.sub(r"\D", "", value)
+
     @staticmethod
     def validate_phone(value: str) -> bool:
         pattern = re.compile(r"^\d{10}$")
@@ -56,12 +97,16 @@ class Phone(Field):
 
 
 class Birthday(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        if self.validate_date(value):
+        try:
+            if not self.validate_date(value):
+                raise ValueError
             b_date = datetime.strptime(value.strip(), "%d.%m.%Y").date()
-            super().__init__(b_date)
-        else:
-            raise DateFormatError("Invalid date format. Use DD.MM.YYYY")
+        except ValueError:
+            raise DateFormatError("Invalid date format. Use DD.MM.YYYY") from None
+        super().__init__(b_date)
 
     @staticmethod
     def validate_date(value):
@@ -76,15 +121,26 @@ class Birthday(Field):
 
 
 class Email(Field):
+    __slots__ = ()
+
     def __init__(self, value):
+        # email_validator pulls in idna and dnspython, it is imported on first use
+        from email_validator import EmailNotValidError, validate_email
+
         try:
             email_info = validate_email(value, check_deliverability=False)
             super().__init__(email_info.normalized)
         except EmailNotValidError as e:
             raise EmailFormatError(f"Invalid email format: {e.args[0]}") from e
 
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.strip().lower()
+
     @staticmethod
     def is_email_valid(value: str):
+        from email_validator import EmailNotValidError, validate_email
+
         try:
             validate_email(value, check_deliverability=False)
             return True
@@ -96,21 +152,29 @@ class Email(Field):
 
 
 class Address(Field):
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(value.strip())
 
 
 class Record:
+    __slots__ = ("name", "phones", "birthday", "emails", "address", "_book", "__weakref__")
+
     def __init__(self, name: str):
         self.name = Name(name)
         self.phones: list[Phone] = []
         self.birthday: Optional[Birthday] = None
         self.emails: list[Email] = []
         self.address: Optional[Address] = None
+        self._book: "AddressBook | None" = None
 
     def add_phone(self, new_phone: str) -> bool:
         if self.__get_phone_index(new_phone) is None:
-            self.phones.append(Phone(new_phone))
+            phone = Phone(new_phone)
+            self._check_unique(phones=[phone.value])
+            self.phones.append(phone)
+            self._changed()
             return True
         return False
 
@@ -118,13 +182,17 @@ class Record:
         index = self.__get_phone_index(phone_number)
         if index is not None:
             self.phones.pop(index)
+            self._changed()
             return True
         return False
 
     def edit_phone(self, old_number: str, new_number: str) -> bool:
         index = self.__get_phone_index(old_number)
         if index is not None:
-            self.phones[index] = Phone(new_number)
+            phone = Phone(new_number)
+            self._check_unique(phones=[phone.value])
+            self.phones[index] = phone
+            self._changed()
             return True
         return False
 
@@ -133,7 +201,10 @@ class Record:
 
     def add_email(self, new_email: str) -> bool:
         if self.__get_email_index(new_email) is None:
-            self.emails.append(Email(new_email))
+            email = Email(new_email)
+            self._check_unique(emails=[email.value])
+            self.emails.append(email)
+            self._changed()
             return True
         return False
 
@@ -141,13 +212,17 @@ class Record:
         index = self.__get_email_index(email_address)
         if index is not None:
             self.emails.pop(index)
+            self._changed()
             return True
         return False
 
     def edit_email(self, old_email: str, new_email: str) -> bool:
         index = self.__get_email_index(old_email)
         if index is not None:
-            self.emails[index] = Email(new_email)
+            email = Email(new_email)
+            self._check_unique(emails=[email.value])
+            self.emails[index] = email
+            self._changed()
             return True
         return False
 
@@ -159,9 +234,32 @@ class Record:
             self.birthday = None
         else:
             self.birthday = Birthday(b_date)
+        self._changed()
 
     def set_address(self, address: str | None) -> None:
         self.address = None if address is None or address == "" else Address(address)
+        self._changed()
+
+    def _check_unique(self, *, phones: list[str] = (), emails: list[str] = ()) -> None:
+        if self._book is not None:
+            self._book.check_unique(self.name.value, phones=phones, emails=emails)
+
+    def _changed(self) -> None:
+        if self._book is not None:
+            self._book._record_changed(self)
+
+    def search_fields(self) -> list[str]:
+        """
+        Returns lowercased values of all fields that `check` looks into
+        """
+        fields = [self.name.value.lower()]
+        fields.extend(phone.value for phone in self.phones)
+        if self.birthday:
+            fields.append(self.birthday.stringify_date())
+        fields.extend(email.value.lower() for email in self.emails)
+        if self.address:
+            fields.append(self.address.value.lower())
+        return fields
 
     def get_info(self) -> list:
         phones = "; ".join(p.value for p in self.phones) if self.phones else "-"
@@ -186,6 +284,25 @@ class Record:
                 return index
         return None
 
+    def __getstate__(self):
+        return {
+            "name": self.name,
+            "phones": self.phones,
+            "birthday": self.birthday,
+            "emails": self.emails,
+            "address": self.address,
+        }
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        self.name = state["name"]
+        self.phones = state.get("phones", [])
+        self.birthday = state.get("birthday")
+        self.emails = state.get("emails", [])
+        self.address = state.get("address")
+        self._book = None
+
     def __str__(self):
         phones = "; ".join(p.value for p in self.phones)
         birthday = (
@@ -242,63 +359,256 @@ class Record:
             return True
         return False
 
+ChangeObserver = Callable[[str, str, object], None]
+
+
+def birthday_key(date: datetime.date) -> int:
+    """
+    Orders dates by month and day only, e.g. 31.12 -> 1231
+    """
+    return date.month * 100 + date.day
+
+
+def birthday_in_year(date: datetime.date, year: int) -> datetime.date:
+    """
+    Moves a birthday to the given year, 29.02 is celebrated on 28.02 in
+    non-leap years
+    """
+    try:
+        return date.replace(year=year)
+    except ValueError:
+        return date.replace(year=year, day=28)
+
+
+def birthday_key_ranges(start: datetime.date, days: int) -> list[tuple[int, int]]:
+    """
+    Returns inclusive ranges of birthday keys for a window of days starting
+    at the given date, split in two when the window wraps over new year
+    """
+    if days <= 0:
+        return []
+    end = start + timedelta(days=days - 1)
+    end_key = birthday_key(end)
+    if end_key == 228 and not calendar.isleap(end.year):
+        # 29.02 falls on the last day of the window
+        end_key = 229
+    if end.year == start.year:
+        return [(birthday_key(start), end_key)]
+    return [(birthday_key(start), 1231), (101, end_key)]
+
+
+def record_birthday_key(record: "Record") -> int | None:
+    return birthday_key(record.birthday.value) if record.birthday else None
+
+
+def record_phones(record: Record) -> list[str]:
+    return [Phone.normalize(phone.value) for phone in record.phones]
+
+
+def record_emails(record: Record) -> list[str]:
+    return [Email.normalize(email.value) for email in record.emails]
+
+
+def record_name(name: str, record: Record) -> tuple[str]:
+    return (name,)
+
+
 class AddressBook(UserDict[str, Record]):
+    """
+    Stores contacts by name and reports every change ("put" or "delete" of a
+    record under its name) to the subscribed observers.
+
+    Indexes are built on first use and then kept up to date as observers.
+    With `unique_keys` set, a phone or an email can belong to one contact only.
+    `changes` counts the changes, the book is `dirty` until it is saved.
+    """
+
+    unique_keys = False
+
+    def __init__(self, *args, **kwargs):
+        self._observers: list[ChangeObserver] = []
+        self._indexes: dict[str, object] = {}
+        self.changes = 0
+        self.saved_changes = 0
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        self.check_unique(key, phones=[p.value for p in record.phones], emails=[e.value for e in record.emails])
+        previous = self.data.get(key)
+        if previous is not None and previous is not record:
+            previous._book = None
+        record._book = self
+        self.data[key] = record
+        self._notify("put", key, record)
+
+    def __delitem__(self, key: str) -> None:
+        record = self.data.pop(key)
+        record._book = None
+        self._notify("delete", key, None)
+
+    def subscribe(self, observer: ChangeObserver) -> None:
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer: ChangeObserver) -> None:
+        self._observers.remove(observer)
+
+    def apply_change(self, op: str, key: str, record: Record | None) -> None:
+        """
+        Applies a change reported by an observer, e.g. when replaying a journal
+        """
+        match op:
+            case "put":
+                self[key] = record
+            case "delete":
+                if key in self.data:
+                    del self[key]
+            case _:
+                raise ValueError(f"Unknown change operation {op}")
+
+    def _record_changed(self, record: Record) -> None:
+        self._notify("put", record.name.value, record)
+
+    @property
+    def dirty(self) -> bool:
+        return self.changes != self.saved_changes
+
+    def mark_saved(self, changes: int) -> None:
+        """
+        Records that the state after the given number of changes was saved
+        """
+        self.saved_changes = changes
+
+    def _notify(self, op: str, key: str, record: Record | None) -> None:
+        self.changes += 1
+        for observer in self._observers:
+            observer(op, key, record)
+
+    def _get_index(self, name: str, factory: Callable[[], object], *, keys_only: bool = False):
+        """
+        Builds the index on first use and keeps it in sync with the book.
+        Indexes over names only are built with `keys_only`, so lazy books
+        do not have to load every record.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            index = factory()
+            items = ((key, None) for key in self.data) if keys_only else self.data.items()
+            for key, record in items:
+                index.update("put", key, record)
+            self.subscribe(index.update)
+            self._indexes[name] = index
+        return index
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        index = self._get_index("phones", lambda: KeyIndex(record_phones))
+        return [self.data[name] for name in index.find(Phone.normalize(phone))]
+
+    def find_by_email(self, email: str) -> list[Record]:
+        index = self._get_index("emails", lambda: KeyIndex(record_emails))
+        return [self.data[name] for name in index.find(Email.normalize(email))]
+
+    def complete_names(self, prefix: str, limit: int = 10) -> list[str]:
+        return self._get_index("names", lambda: PrefixIndex(record_name), keys_only=True).complete(prefix, limit)
+
+    def check_unique(self, name: str, *, phones: list[str] = (), emails: list[str] = ()) -> None:
+        """
+        Raises an error when `unique_keys` is set and one of the phones or
+        emails already belongs to another contact
+        """
+        if not self.unique_keys:
+            return
+        for phone in phones:
+            for owner in self.find_by_phone(phone):
+                if owner.name.value != name:
+                    raise PhoneExistsError(f"Phone {phone} already belongs to {owner.name.value}")
+        for email in emails:
+            for owner in self.find_by_email(email):
+                if owner.name.value != name:
+                    raise EmailExistsError(f"Email {email} already belongs to {owner.name.value}")
+
     def add_record(self, record: Record) -> None:
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def add(self, name: str) -> Record:
-        record = Record(name.strip().capitalize())
+        record = Record(name)
 
-        self.data[name] = record
+        self.add_record(record)
 
         return record
 
     def find(self, name: str) -> Record | None:
         return self.data.get(name.strip().capitalize())
 
+    def find_similar(self, name: str, max_distance: int = 2, limit: int = 5) -> list[Record]:
+        """
+        Contacts with names within `max_distance` typos of the name, closest first
+        """
+        index = self._get_index("fuzzy", FuzzyIndex, keys_only=True)
+        return [self.data[key] for _, key in index.search(name, max_distance, limit)]
+
     def delete(self, name: str) -> bool:
         try:
-            del self.data[name.strip().capitalize()]
+            del self[name.strip().capitalize()]
             return True
         except KeyError:
             return False
 
+    def search(self, term: str) -> list[Record]:
+        names = self._get_index("search", TrigramIndex).candidates(term.strip().lower())
+        if names is None:
+            return [record for record in self.data.values() if record.check(term)]
+
+        records = (self.data[name] for name in sorted(names))
+        return [record for record in records if record.check(term)]
+
     def get_upcoming_birthday(self, limit=7) -> list:
         today_date = datetime.today().date()
         congrat_list = []
 
-        for record in self.data.values():
-            if not record.birthday:
-                continue
+        index = self._get_index("birthdays", lambda: BirthdayIndex(record_birthday_key))
+        for low, high in birthday_key_ranges(today_date, limit):
+            for name in index.between(low, high):
+                congratulation = self._congratulation(self.data[name], today_date, limit)
+                if congratulation:
+                    congrat_list.append(congratulation)
 
-            birthday_data_obj = record.birthday.value
-            birthday_this_year = birthday_data_obj.replace(year=today_date.year)
+        return congrat_list
 
-            if birthday_this_year < today_date:
-                birthday_this_year = birthday_this_year.replace(
-                    year=today_date.year + 1
-                )
+    def _congratulation(self, record: Record, today_date: datetime.date, limit: int) -> dict | None:
+        if not record.birthday:
+            return None
 
-            days_until_birthday = (birthday_this_year - today_date).days
+        birthday_data_obj = record.birthday.value
+        birthday_this_year = birthday_in_year(birthday_data_obj, today_date.year)
 
-            if 0 <= days_until_birthday < limit:
-                congrats_date = birthday_this_year + timedelta(
-                    days=self.__check_weekend(birthday_this_year)
-                )
+        if birthday_this_year < today_date:
+            birthday_this_year = birthday_in_year(birthday_data_obj, today_date.year + 1)
 
-                congrat_list.append(
-                    {
-                        "name": record.name.value,
-                        "birthday": record.birthday.value,
-                        "congratulation_date": congrats_date.strftime("%d.%m.%Y"),
-                    }
-                )
+        days_until_birthday = (birthday_this_year - today_date).days
 
-        return congrat_list
+        if 0 <= days_until_birthday < limit:
+            congrats_date = birthday_this_year + timedelta(
+                days=self.__check_weekend(birthday_this_year)
+            )
+
+            return {
+                "name": record.name.value,
+                "birthday": record.birthday.value,
+                "congratulation_date": congrats_date.strftime("%d.%m.%Y"),
+            }
+
+        return None
 
     def list_records(self) -> list[Record]:
         return [record for record in self.data.values()]
 
+    def records_page(self, start: int, count: int) -> list[Record]:
+        """
+        Returns `count` records starting at position `start`, only these
+        records are loaded by lazy storages
+        """
+        return [self.data[name] for name in islice(self.data, start, start + count)]
+
     def __check_weekend(self, date: datetime.date) -> int:
         match date.isoweekday():
             case 6:
@@ -308,9 +618,34 @@ class AddressBook(UserDict[str, Record]):
             case _:
                 return 0
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_observers", "_indexes", "changes", "saved_changes"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._observers = []
+        self._indexes = {}
+        self.changes = 0
+        self.saved_changes = 0
+        for record in self.data.values():
+            record._book = self
+
     def save(self, filename="addressbook.pkl") -> None:
-        with open(filename, "wb") as f:
+        """
+        Writes the book to a temporary file first and replaces the file with
+        it, so a crash while saving never leaves a truncated book behind
+        """
+        changes = self.changes
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
             pickle.dump(self, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+        self.mark_saved(changes)
 
     @staticmethod
     def load(filename: str = "addressbook.pkl") -> "AddressBook":
@@ -318,7 +653,7 @@ class AddressBook(UserDict[str, Record]):
             with open(filename, "rb") as f:
                 return pickle.load(f)
         except (FileNotFoundError, EOFError, pickle.UnpicklingError):
-            print("⚠️ Address Book not found, created new.")
+            print("⚠️ Address Book not found, created new.", file=sys.stderr)
             return AddressBook()
 
     def __str__(self) -> str:
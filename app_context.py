@@ -1,15 +1,71 @@
+import sys
+import threading
+from collections.abc import Callable
+
 from app_state import AppState
-from interface import AppInterface
+from instrumentation import stats
+from interface import AppInterface, MachineInterface
+from startup_profile import StartupProfile
+
+class StateLoader(threading.Thread):
+    """
+    Loads the state in background, `result` waits for it and re-raises
+    errors of loading in the calling thread
+    """
+
+    def __init__(self, load: Callable[[], AppState]):
+        super().__init__(name="load-state", daemon=True)
+        self.load = load
+        self.state: AppState | None = None
+        self.error: BaseException | None = None
+
+    def run(self):
+        try:
+            self.state = self.load()
+        except BaseException as e:
+            self.error = e
+
+    def result(self) -> AppState:
+        self.join()
+        if self.error is not None:
+            raise self.error
+        return self.state
 
 class AppContext:
     """
     Provides a context related to the app
     """
 
-    def __init__(self, *, state: AppState, interface: AppInterface):
-        self.state = state
+    def __init__(self, *, state: AppState | StateLoader, interface: AppInterface):
+        self._state = state
         self.interface = interface
 
+    @property
+    def state(self) -> AppState:
+        """
+        The state, waiting for it when it is still being loaded in background
+        """
+        if isinstance(self._state, StateLoader):
+            self._state = self._state.result()
+        return self._state
+
     @staticmethod
-    def create():
-        return AppContext(state=AppState.load(), interface=AppInterface())
+    def create(*, storage: str = 'pickle', unique_keys: bool = False, codec: str = None, output: str = None,
+               profile: StartupProfile = None):
+        """
+        Starts loading the stores in background and returns right away,
+        the first use of `state` waits for them
+        """
+        if output is None:
+            output = 'rich' if sys.stdout.isatty() else 'tsv'
+
+        def load():
+            with stats.measure("state.load"):
+                return AppState.load(storage=storage, unique_keys=unique_keys, codec=codec)
+
+        state = StateLoader(lambda: profile.timed("stores", load) if profile else load())
+        state.start()
+
+        interface = AppInterface() if output == 'rich' else MachineInterface(output)
+
+        return AppContext(state=state, interface=interface)
@@ -1,21 +1,65 @@
+import threading
+from collections.abc import Callable
+
 from addressbook import AddressBook
 from notes import NotesManager
+from storage import STORAGES, PickleStorage
 
 class AppState:
     """
-    Combines all parts of bots state and handles their persistence
+    Combines all parts of bots state and handles their persistence.
+
+    Commands use the stores holding `lock` and let it go while they wait
+    for the user, saving takes it too, so a background save never runs in
+    the middle of a store change and never waits for a prompt.
     """
-    def __init__(self, *, notes: NotesManager, book: AddressBook):
+    def __init__(self, *, notes: NotesManager, book: AddressBook, storage: PickleStorage = None):
         self.book = book
         self.notes = notes
+        self.storage = storage if storage else PickleStorage()
+        self.lock = threading.RLock()
 
     @staticmethod
-    def load(*, notes_file: str = None, book_file: str = None) -> "AppState":
-        notes = NotesManager.load(notes_file) if notes_file else NotesManager.load()
-        book = AddressBook.load(book_file) if book_file else AddressBook.load()
+    def load(*, notes_file: str = None, book_file: str = None, storage: str = 'pickle',
+             unique_keys: bool = False, codec: str = None) -> "AppState":
+        files = {}
+        if notes_file:
+            files['notes_file'] = notes_file
+        if book_file:
+            files['book_file'] = book_file
+        if codec:
+            # only block storage compresses
+            files['codec'] = codec
+
+        storage = STORAGES[storage](**files)
+
+        notes = storage.load_notes()
+        book = storage.load_book()
+        book.unique_keys = unique_keys
 
-        return AppState(notes=notes, book=book)
+        return AppState(notes=notes, book=book, storage=storage)
+
+    def locked(self, fn: Callable) -> Callable:
+        """
+        `fn` taking `lock` when called, for completers and page fetches
+        run while the command waits for the user
+        """
+        def call(*args, **kwargs):
+            with self.lock:
+                return fn(*args, **kwargs)
+
+        return call
 
     def save(self):
-        self.book.save()
-        self.notes.save()
+        """
+        Saves the stores changed since they were last saved
+        """
+        with self.lock:
+            if self.book.dirty:
+                self.storage.save_book(self.book)
+            if self.notes.dirty:
+                self.storage.save_notes(self.notes)
+
+    def close(self):
+        with self.lock:
+            self.storage.close()
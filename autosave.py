@@ -0,0 +1,73 @@
+import sys
+import threading
+import time
+
+from collections.abc import Callable
+
+from app_state import AppState
+
+
+class Autosaver(threading.Thread):
+    """
+    Saves the state in background `delay` seconds after the last change,
+    or right away once `every` changes are waiting to be saved.
+
+    Saving takes `AppState.lock`, so it waits for a command's store changes
+    to finish but never for the user typing at one of its prompts. `save`
+    replaces `AppState.save` when readers need to be kept out too.
+    """
+
+    def __init__(self, state: AppState, *, delay: float = 2.0, every: int = 50,
+                 save: Callable[[], None] | None = None):
+        super().__init__(name="autosave", daemon=True)
+        self.state = state
+        self.save = save or state.save
+        self.delay = delay
+        self.every = every
+        self.condition = threading.Condition()
+        self.pending = 0
+        self.last_change = 0.0
+        self.stopped = False
+        state.book.subscribe(self.changed)
+        state.notes.subscribe(self.changed)
+
+    def changed(self, op: str, key: str, value) -> None:
+        """
+        Store observer, counts changes and restarts the delay
+        """
+        with self.condition:
+            self.pending += 1
+            self.last_change = time.monotonic()
+            self.condition.notify()
+
+    def run(self) -> None:
+        with self.condition:
+            while not self.stopped:
+                if not self.pending:
+                    self.condition.wait()
+                    continue
+                wait = self.last_change + self.delay - time.monotonic()
+                if self.pending < self.every and wait > 0:
+                    self.condition.wait(wait)
+                    continue
+
+                self.pending = 0
+                self.condition.release()
+                try:
+                    self.save()
+                except Exception as e:
+                    print(f"⚠️ Autosave failed: {e}", file=sys.stderr)
+                finally:
+                    self.condition.acquire()
+
+    def stop(self) -> None:
+        """
+        Stops the thread after a save in progress, changes it did not save
+        are left for the final `AppState.save`
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.join()
+        self.state.book.unsubscribe(self.changed)
+        self.state.notes.unsubscribe(self.changed)
@@ -0,0 +1,196 @@
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from addressbook import Address, AddressBook, Birthday, Email, Phone, Record
+from notes import Note, NotesManager, note_key
+
+SYLLABLES = ["an", "bel", "cor", "da", "el", "fi", "gor", "ha", "ir", "jo", "ka", "lin",
+             "mar", "no", "ol", "pe", "qui", "ro", "sa", "ta", "ul", "vi", "wen", "xa", "yo", "zen"]
+DOMAINS = ["example.com", "mail.test", "post.example.org", "inbox.test"]
+STREETS = ["Main st", "Park ave", "Oak rd", "River ln", "Hill st", "Lake dr"]
+WORDS = ["meeting", "call", "buy", "milk", "project", "idea", "review", "book", "travel", "plan",
+         "budget", "report", "doctor", "gift", "birthday", "code", "release", "bug", "garden", "car"]
+TAGS = [f"{word}{i}" for word in ("work", "home", "todo", "idea", "later") for i in range(40)]
+
+
+def synthetic_name(rng: random.Random, i: int) -> str:
+    """
+    Pronounceable and unique name, the index makes sure no two are the same
+    """
+    first = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{first} {last}{i}".capitalize()
+
+
+def synthetic_records(size: int, seed: int) -> list[Record]:
+    """
+    Contacts with one to three phones, up to two emails, a birthday for
+    most of them and an address for some. Fields are built with
+    `Field.trusted`, the values are valid by construction.
+    """
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    records = []
+    for i in range(size):
+        record = Record(synthetic_name(rng, i))
+        record.phones = [Phone.trusted(f"0{rng.randrange(10 ** 9):09d}") for _ in range(rng.randint(1, 3))]
+        login = record.name.value.lower().replace(" ", ".")
+        record.emails = [Email.trusted(f"{login}@{rng.choice(DOMAINS)}") for _ in range(rng.randint(0, 2))]
+        if rng.random() < 0.8:
+            record.birthday = Birthday.trusted(start + timedelta(days=rng.randrange(365 * 55)))
+        if rng.random() < 0.3:
+            record.address = Address.trusted(f"{rng.randint(1, 200)} {rng.choice(STREETS)}")
+        records.append(record)
+    return records
+
+
+def synthetic_notes(size: int, seed: int) -> list[Note]:
+    rng = random.Random(seed)
+    notes = []
+    for i in range(size):
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60)))
+        notes.append(Note(title, content, rng.sample(TAGS, rng.randint(0, 4))))
+    return notes
+
+
+def timed(fn: Callable[[], object], ops: int = 1) -> dict:
+    started = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - started
+    return {"ops": ops, "seconds": round(seconds, 6), "per_op_us": round(seconds / ops * 1e6, 3)}
+
+
+def bench_book(records: list[Record], queries: int, rng: random.Random, directory: str) -> dict:
+    results = {}
+    book = AddressBook()
+
+    def add_all():
+        for record in records:
+            book.add_record(record)
+
+    results["add"] = timed(add_all, len(records))
+    results["add_one"] = timed(lambda: book.add("Benchmark contact"))
+
+    names = [record.name.value for record in rng.sample(records, min(queries, len(records)))]
+    results["find"] = timed(lambda: [book.find(name) for name in names], len(names))
+    misses = [f"{name}x" for name in names]
+    results["find_missing"] = timed(lambda: [book.find(name) for name in misses], len(misses))
+
+    terms = [names[0][:4].lower(), records[0].phones[0].value[3:8], "1984", "@mail.test"]
+    results["check_scan"] = timed(lambda: [[r for r in book.values() if r.check(term)] for term in terms],
+                                  len(terms))
+    results["search_first"] = timed(lambda: book.search(terms[0]))
+    results["search"] = timed(lambda: [book.search(term) for term in terms], len(terms))
+
+    results["upcoming_birthdays_first"] = timed(lambda: book.get_upcoming_birthday())
+    results["upcoming_birthdays"] = timed(lambda: [book.get_upcoming_birthday(limit=days) for days in (7, 30)], 2)
+
+    filename = os.path.join(directory, "addressbook.pkl")
+    results["save"] = timed(lambda: book.save(filename))
+    results["save"]["bytes"] = os.path.getsize(filename)
+    results["load"] = timed(lambda: AddressBook.load(filename))
+
+    results["delete"] = timed(lambda: [book.delete(name) for name in names], len(names))
+    return results
+
+
+def bench_notes(notes: list[Note], queries: int, rng: random.Random, directory: str) -> dict:
+    results = {}
+    manager = NotesManager()
+
+    def add_all():
+        for note in notes:
+            manager.apply_change("put", note_key(note.title), note)
+
+    results["add"] = timed(add_all, len(notes))
+
+    titles = [note.title for note in rng.sample(notes, min(queries, len(notes)))]
+    results["find_note_by_title"] = timed(lambda: [manager.find_note_by_title(title) for title in titles],
+                                          len(titles))
+
+    tags = rng.sample(TAGS, 10)
+    results["search_notes_by_tags_first"] = timed(lambda: manager.search_notes_by_tags(tags[0]))
+    results["search_notes_by_tags"] = timed(lambda: [manager.search_notes_by_tags(tag) for tag in tags],
+                                            len(tags))
+
+    filename = os.path.join(directory, "notes.pkl")
+    results["save"] = timed(lambda: manager.save(filename))
+    results["save"]["bytes"] = os.path.getsize(filename)
+    results["load"] = timed(lambda: NotesManager.load(filename))
+    return results
+
+
+def run(sizes: list[int], *, seed: int = 42, queries: int = 1000) -> dict:
+    report = {
+        "seed": seed,
+        "queries": queries,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for size in sizes:
+        rng = random.Random(seed)
+        with tempfile.TemporaryDirectory() as directory:
+            report["results"][str(size)] = {
+                "contacts": bench_book(synthetic_records(size, seed), queries, rng, directory),
+                "notes": bench_notes(synthetic_notes(size, seed), queries, rng, directory),
+            }
+        print(f"{size} done", file=sys.stderr)
+    return report
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    """
+    Lines with the change of time per operation against a baseline report
+    """
+    lines = []
+    for size, stores in report["results"].items():
+        for store, results in stores.items():
+            for name, result in results.items():
+                old = baseline["results"].get(size, {}).get(store, {}).get(name)
+                if old and old["per_op_us"]:
+                    ratio = result["per_op_us"] / old["per_op_us"]
+                    lines.append(f"{size:>8} {store:<8} {name:<28} {old['per_op_us']:>12.3f} -> "
+                                 f"{result['per_op_us']:>12.3f} us  x{ratio:.2f}")
+    return lines
+
+
+def parse_args():
+    parser = ArgumentParser(description="Benchmarks of the address book and notes on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="numbers of contacts and notes to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=1000,
+                        help="number of lookups timed by find and delete benchmarks")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON report to a file instead of stdout")
+    parser.add_argument("--compare", metavar="FILE", help="print changes against an earlier JSON report")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    report = run(args.sizes, seed=args.seed, queries=args.queries)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(report, json.load(f))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from addressbook import AddressBook
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class BirthdayColumns:
+    """
+    Columnar copy of the birthdays in an address book.
+
+    Every report is computed with whole-array numpy operations, so it is
+    one pass over the columns instead of a Python loop over records.
+    """
+
+    def __init__(self, names: list[str], birthdays: list[date]):
+        self.names = np.array(names, dtype=object)
+        self.years = np.fromiter((b.year for b in birthdays), dtype=np.int32, count=len(birthdays))
+        self.months = np.fromiter((b.month for b in birthdays), dtype=np.int8, count=len(birthdays))
+        self.days = np.fromiter((b.day for b in birthdays), dtype=np.int8, count=len(birthdays))
+        self.weekdays = self.__weekday(self.__dates(self.years))
+
+    @staticmethod
+    def from_book(book: AddressBook) -> "BirthdayColumns":
+        names = []
+        birthdays = []
+        for record in book.values():
+            if record.birthday:
+                names.append(record.name.value)
+                birthdays.append(record.birthday.value)
+        return BirthdayColumns(names, birthdays)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __dates(self, years) -> np.ndarray:
+        """
+        Birthdays moved to the given year(s), 29.02 becomes 28.02 in non-leap years
+        """
+        months = (np.asarray(years, dtype=np.int64) - 1970) * 12 + (self.months - 1)
+        month_starts = months.astype("datetime64[M]")
+        month_lengths = (month_starts + 1).astype("datetime64[D]") - month_starts.astype("datetime64[D]")
+        days = np.minimum(self.days.astype(np.int64), month_lengths.astype(np.int64))
+        return month_starts.astype("datetime64[D]") + (days - 1)
+
+    @staticmethod
+    def __weekday(dates: np.ndarray) -> np.ndarray:
+        # 1970-01-01 was a Thursday, 0 is Monday
+        return ((dates.astype(np.int64) + 3) % 7).astype(np.int8)
+
+    def ages(self, today: date) -> np.ndarray:
+        had_birthday = self.__dates(today.year) <= np.datetime64(today)
+        return today.year - self.years - (~had_birthday).astype(np.int32)
+
+    def age_distribution(self, today: date, bucket: int = 10) -> dict[str, int]:
+        """
+        Count of contacts per age range, e.g. {"20-29": 12}
+        """
+        ages = self.ages(today)
+        if not len(ages):
+            return {}
+        counts = np.bincount(np.maximum(ages, 0) // bucket)
+        return {
+            f"{i * bucket}-{(i + 1) * bucket - 1}": int(count)
+            for i, count in enumerate(counts)
+            if count
+        }
+
+    def month_histogram(self) -> dict[str, int]:
+        counts = np.bincount(self.months.astype(np.int64) - 1, minlength=12)
+        return dict(zip(MONTHS, (int(count) for count in counts)))
+
+    def weekday_histogram(self) -> dict[str, int]:
+        """
+        Count of contacts per day of the week they were born on
+        """
+        counts = np.bincount(self.weekdays.astype(np.int64), minlength=7)
+        return dict(zip(WEEKDAYS, (int(count) for count in counts)))
+
+    def born_on(self, day: date) -> list[str]:
+        """
+        Names of contacts celebrating their birthday on the given date
+        """
+        return list(self.names[self.__dates(day.year) == np.datetime64(day)])
+
+    def report(self, today: date) -> dict:
+        return {
+            "total": len(self),
+            "today": self.born_on(today),
+            "tomorrow": self.born_on(today + timedelta(days=1)),
+            "months": self.month_histogram(),
+            "weekdays": self.weekday_histogram(),
+            "ages": self.age_distribution(today),
+        }
@@ -1,9 +1,23 @@
+# measures everything imported below, so it has to come first
+from startup_profile import StartupProfile
+
+startup = StartupProfile()
+
+import shlex
+import sys
+from argparse import ArgumentParser, FileType
+from collections.abc import Iterable
 from functools import wraps
 
-from addressbook import (DateFormatError, EmailFormatError,
-                         PhoneFormatError)
+from addressbook import (DateFormatError, EmailExistsError, EmailFormatError,
+                         NameFormatError, PhoneExistsError, PhoneFormatError,
+                         RangeFormatError)
 from app_context import AppContext
 from commands import COMMANDS
+from interface import OUTPUT_FORMATS
+from instrumentation import instrument_app, stats
+from interface.prompt_script import ScriptError, prompt_script
+from storage import CODECS, STORAGES
 
 def input_error(func):
     @wraps(func)
@@ -40,12 +54,168 @@ def parse_input(user_input):
     return command, *args
 
 
-def main():
-    print("Welcome to Personal Helper")
+def batch_error(e: Exception) -> str:
+    match e:
+        case RangeFormatError():
+            return e.message
+        case NameFormatError():
+            return "Name cannot be blank"
+        case PhoneFormatError():
+            return "Wrong phone format."
+        case EmailFormatError():
+            return "Wrong email format."
+        case DateFormatError():
+            return "Invalid date format. Use DD.MM.YYYY"
+        case ScriptError() | PhoneExistsError() | EmailExistsError() | ValueError():
+            return str(e)
+        case _:
+            return f"{type(e).__name__}: {e}"
+
+
+def run_batch(context: AppContext, lines: Iterable[str], save_every: int = 0) -> int:
+    """
+    Runs commands of a script without prompting and returns the number of
+    failed lines. Each line is a command followed by the answers to its
+    prompts in shell syntax, e.g. `add contact "John Smith" 0501234567`,
+    missing optional answers are left empty. A failing line is reported and
+    the script goes on with the next one.
+    """
+    failed = 0
+    operations = 0
+
+    for number, line in enumerate(lines, start=1):
+        try:
+            parts = shlex.split(line, comments=True)
+        except ValueError as e:
+            context.interface.draw_failure(f"line {number}: {e}")
+            failed += 1
+            continue
+        if not parts:
+            continue
+
+        command = " ".join(parts[:2]).lower()
+        if command in COMMANDS:
+            answers = parts[2:]
+        else:
+            command, answers = parts[0].lower(), parts[1:]
+
+        command_fn = COMMANDS.get(command)
+        if command_fn is None:
+            context.interface.draw_failure(f"line {number}: Invalid command {command}")
+            failed += 1
+            continue
+
+        prompt_script.start(answers)
+        try:
+            with stats.measure(f"command.{command}"):
+                command_fn(context)
+        except Exception as e:
+            context.interface.draw_failure(f"line {number}: {command}: {batch_error(e)}")
+            failed += 1
+        finally:
+            unused = prompt_script.finish()
+        if unused:
+            context.interface.draw_warning(f"line {number}: {command}: unused arguments {' '.join(unused)}")
+
+        operations += 1
+        if save_every and operations % save_every == 0:
+            context.state.save()
+
+    return failed
+
+
+def run_command(context: AppContext, command: str) -> None:
+    """
+    Runs a command typed at the prompt. Commands take `AppState.lock`
+    only around their store changes, never while prompting.
+    """
+    command_fn = COMMANDS.get(command)
+
+    if command_fn is None:
+        context.interface.draw_failure("Invalid command")
+    else:
+        with stats.measure(f"command.{command}"):
+            command_fn(context)
+
+
+def parse_args():
+    parser = ArgumentParser(description="Contacts & Notes Bot")
+    parser.add_argument("--storage", choices=STORAGES.keys(), default="pickle",
+                        help="how the address book and notes are persisted")
+    parser.add_argument("--unique-keys", action="store_true",
+                        help="do not allow the same phone or email on several contacts")
+    parser.add_argument("--codec", choices=CODECS.keys(),
+                        help="compression of block storage files (default: zlib)")
+    parser.add_argument("--output", choices=OUTPUT_FORMATS,
+                        help="rich tables, or plain TSV/JSONL rows for scripts "
+                             "(default: rich on a terminal, tsv when output is piped)")
+    parser.add_argument("--batch", metavar="FILE", type=FileType("r", encoding="utf-8"),
+                        help="run commands from a file ('-' for stdin) without prompting")
+    parser.add_argument("--save-every", metavar="N", type=int, default=0,
+                        help="in batch mode also save after every N commands")
+    parser.add_argument("--autosave", metavar="SECONDS", type=float, default=2.0,
+                        help="save in background this long after the last change, 0 saves on exit only")
+    parser.add_argument("--autosave-every", metavar="N", type=int, default=50,
+                        help="save in background right away once N changes are unsaved")
+    parser.add_argument("--stats-file", metavar="FILE",
+                        help="write latencies of commands, store operations and rendering to a JSON file on exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="report where the startup time goes (imports, loading, drawing) to stderr")
+    args = parser.parse_args()
+    if args.codec and args.storage != "blocks":
+        parser.error("--codec only applies to --storage blocks")
+    return args
+
 
-    context = AppContext.create()
+def main():
+    args = parse_args()
+    startup.mark("imports")
+
+    # stores are loaded in background while the interface is set up
+    context = AppContext.create(storage=args.storage, unique_keys=args.unique_keys, codec=args.codec,
+                                output=args.output, profile=startup)
+    startup.mark("interface")
+
+    if args.batch:
+        context.state  # waits for the stores
+        startup.mark("stores")
+        instrument_app(context)
+        try:
+            failed = run_batch(context, args.batch, args.save_every)
+            startup.mark("batch")
+        finally:
+            # whatever ran before an interrupt is kept
+            context.state.save()
+            context.state.close()
+        startup.mark("save")
+        if args.startup_profile:
+            startup.report()
+        if args.stats_file:
+            stats.dump(args.stats_file)
+        sys.exit(1 if failed else 0)
+
+    context.interface.draw_info("Welcome to Personal Helper")
 
     context.interface.draw_header([command for command in COMMANDS.keys()]+['hello', 'quit / exit'])
+    startup.mark("header")
+
+    # prompt_toolkit is imported while the stores are still loading
+    from interface.prompt_command import get_commands_session
+    get_commands_session()
+    startup.mark("prompt")
+
+    context.state  # waits for the stores
+    startup.mark("stores")
+    if args.startup_profile:
+        startup.report()
+
+    instrument_app(context)
+
+    autosaver = None
+    if args.autosave > 0:
+        from autosave import Autosaver
+        autosaver = Autosaver(context.state, delay=args.autosave, every=args.autosave_every)
+        autosaver.start()
 
     while True:
         try:
@@ -57,22 +227,22 @@ def main():
                 case "exit" | "quit":
                     break
                 case "hello":
-                    print("How can I help you?")
+                    context.interface.draw_info("How can I help you?")
                 case _:
-                    command_fn = COMMANDS.get(command)
-
-                    if command_fn is None:
-                        print("❌Invalid command")
-                    else:
-                        command_fn(context)
+                    run_command(context, command)
         except EOFError:
-            print("❗Aborted (Ctrl+D)")
+            context.interface.draw_warning("Aborted (Ctrl+D)")
         except KeyboardInterrupt:
-            print("✋Interrupted by user (Ctrl+C)")
+            context.interface.draw_warning("Interrupted by user (Ctrl+C)")
             break
 
+    if autosaver is not None:
+        autosaver.stop()
     context.state.save()
-    print("📁Address book saved. Bye!")
+    context.state.close()
+    if args.stats_file:
+        stats.dump(args.stats_file)
+    context.interface.draw_success("Address book saved. Bye!")
 
 
 if __name__ == "__main__":
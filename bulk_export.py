@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from addressbook import AddressBook, Record
+from notes import Note, NotesManager
+
+BUFFER_SIZE = 1 << 20
+
+CONTACT_COLUMNS = ["name", "phones", "emails", "birthday", "address"]
+NOTE_COLUMNS = ["title", "content", "tags", "created_at", "updated_at"]
+
+
+def select_contacts(book: AddressBook, *, term: str = "", days: int | None = None) -> Iterator[Record]:
+    """
+    Yields contacts matching the search term and having a birthday in the
+    next `days` days, all contacts when no filter is given
+    """
+    if days:
+        names = (person["name"] for person in book.get_upcoming_birthday(limit=days))
+        records = (book.find(name) for name in names)
+        if term:
+            records = (record for record in records if record.check(term))
+        return records
+    if term:
+        return iter(book.search(term))
+    return iter(book.values())
+
+
+def select_notes(notes: NotesManager, *, tag: str = "") -> Iterator[Note]:
+    if tag:
+        return iter(notes.search_notes_by_tags(tag))
+    return iter(notes.notes)
+
+
+def contact_row(record: Record) -> dict:
+    return {
+        "name": record.name.value,
+        "phones": [phone.value for phone in record.phones],
+        "emails": [email.value for email in record.emails],
+        "birthday": record.birthday.stringify_date() if record.birthday else "",
+        "address": record.address.value if record.address else "",
+    }
+
+
+def note_row(note: Note) -> dict:
+    return {
+        "title": note.title,
+        "content": note.content,
+        "tags": list(note.tags),
+        "created_at": note.created_at.isoformat(),
+        "updated_at": note.updated_at.isoformat(),
+    }
+
+
+def write_csv(f: TextIO, rows: Iterable[dict], columns: list[str]) -> int:
+    """
+    Lists are written as ';' separated values, the same way `bulk_import` reads them
+    """
+    writer = csv.DictWriter(f, fieldnames=columns)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow({key: "; ".join(value) if isinstance(value, list) else value
+                         for key, value in row.items()})
+        count += 1
+    return count
+
+
+def tsv_value(value) -> str:
+    if isinstance(value, list):
+        value = "; ".join(value)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_tsv(f: TextIO, rows: Iterable[dict], columns: list[str], *, header: bool = True) -> int:
+    """
+    Tabs, newlines and backslashes inside values are escaped, so every row is one line
+    """
+    if header:
+        f.write("\t".join(columns) + "\n")
+    count = 0
+    for row in rows:
+        f.write("\t".join(tsv_value(row[column]) for column in columns) + "\n")
+        count += 1
+    return count
+
+
+def write_jsonl(f: TextIO, rows: Iterable[dict], columns: list[str]) -> int:
+    count = 0
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def vcard_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+
+
+def write_vcard(f: TextIO, rows: Iterable[dict], columns: list[str]) -> int:
+    count = 0
+    for row in rows:
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{vcard_escape(row['name'])}"]
+        lines.extend(f"TEL:{phone}" for phone in row["phones"])
+        lines.extend(f"EMAIL:{email}" for email in row["emails"])
+        if row["birthday"]:
+            day, month, year = row["birthday"].split(".")
+            lines.append(f"BDAY:{year}-{month}-{day}")
+        if row["address"]:
+            lines.append(f"ADR:;;{vcard_escape(row['address'])};;;;")
+        lines.append("END:VCARD")
+        f.write("\r\n".join(lines))
+        f.write("\r\n")
+        count += 1
+    return count
+
+
+WRITERS = {
+    ".csv": write_csv,
+    ".jsonl": write_jsonl,
+    ".tsv": write_tsv,
+    ".vcf": write_vcard,
+}
+
+
+def export_format(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
+
+
+def export_rows(filename: str, rows: Iterable[dict], columns: list[str]) -> int:
+    """
+    Streams rows into the file in the format given by its extension and
+    returns their count
+    """
+    writer = WRITERS.get(export_format(filename))
+    if writer is None:
+        raise ValueError(f"Unsupported export format, use one of {', '.join(WRITERS)}")
+    with open(filename, "w", newline="", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        return writer(f, rows, columns)
+
+
+def export_contacts(book: AddressBook, filename: str, *, term: str = "", days: int | None = None) -> int:
+    records = select_contacts(book, term=term, days=days)
+    return export_rows(filename, map(contact_row, records), CONTACT_COLUMNS)
+
+
+def export_notes(notes: NotesManager, filename: str, *, tag: str = "") -> int:
+    if export_format(filename) == ".vcf":
+        raise ValueError("Notes can be exported to .csv, .tsv or .jsonl only")
+    return export_rows(filename, map(note_row, select_notes(notes, tag=tag)), NOTE_COLUMNS)
@@ -0,0 +1,213 @@
+import csv
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from itertools import batched
+
+from addressbook import (AddressBook, Address, Birthday, DateFormatError, Email,
+                         EmailExistsError, EmailFormatError, Name,
+                         NameFormatError, Phone, PhoneExistsError,
+                         PhoneFormatError, Record)
+
+# a row is (line number, fields) where fields has name, phones, emails, birthday and address
+Row = tuple[int, dict]
+
+CSV_COLUMNS = {
+    "name": "name",
+    "phone": "phones",
+    "phones": "phones",
+    "email": "emails",
+    "emails": "emails",
+    "birthday": "birthday",
+    "address": "address",
+}
+
+
+class ImportReport:
+    """
+    Result of a bulk import: number of imported contacts and errors of
+    rejected rows as (line number, message)
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.errors: list[tuple[int, str]] = []
+
+    def write_errors(self, filename: str) -> None:
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "error"])
+            writer.writerows(self.errors)
+
+
+def split_values(value: str | None) -> list[str]:
+    return [part.strip() for part in re.split(r"[;,]", value or "") if part.strip()]
+
+
+def read_csv(filename: str) -> Iterator[Row]:
+    """
+    Streams rows of a CSV file with a header, several phones or emails in
+    one cell are separated with ';'
+    """
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            fields = {"phones": [], "emails": []}
+            for column, value in row.items():
+                key = CSV_COLUMNS.get((column or "").strip().lower())
+                if key in ("phones", "emails"):
+                    fields[key].extend(split_values(value))
+                elif key:
+                    fields[key] = (value or "").strip()
+            yield reader.line_num, fields
+
+
+def unfold_vcard(f) -> Iterator[tuple[int, str]]:
+    """
+    Joins folded vCard lines (continued lines start with a space or a tab)
+    """
+    current, current_number = None, 0
+    for number, line in enumerate(f, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current_number, current
+        current, current_number = line, number
+    if current is not None:
+        yield current_number, current
+
+
+def vcard_birthday(value: str) -> str:
+    digits = value.replace("-", "")
+    if re.fullmatch(r"\d{8}", digits):
+        return f"{digits[6:8]}.{digits[4:6]}.{digits[0:4]}"
+    return value
+
+
+def vcard_unescape(value: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def read_vcard(filename: str) -> Iterator[Row]:
+    """
+    Streams contacts of a vCard file, one row per BEGIN:VCARD ... END:VCARD
+    """
+    with open(filename, encoding="utf-8-sig") as f:
+        fields, start = None, 0
+        for number, line in unfold_vcard(f):
+            prop, _, value = line.partition(":")
+            prop = prop.split(";")[0].split(".")[-1].upper()
+            if prop == "BEGIN" and value.upper() == "VCARD":
+                fields, start = {"phones": [], "emails": []}, number
+            elif fields is None:
+                continue
+            elif prop == "END":
+                yield start, fields
+                fields = None
+            elif prop == "FN":
+                fields["name"] = vcard_unescape(value.strip())
+            elif prop == "TEL":
+                fields["phones"].append(value.strip())
+            elif prop == "EMAIL":
+                fields["emails"].append(value.strip())
+            elif prop == "BDAY":
+                fields["birthday"] = vcard_birthday(value.strip())
+            elif prop == "ADR":
+                parts = (vcard_unescape(part).strip() for part in re.split(r"(?<!\\);", value))
+                fields["address"] = ", ".join(part for part in parts if part)
+
+
+def read_rows(filename: str) -> Iterator[Row]:
+    if filename.lower().endswith((".vcf", ".vcard")):
+        return read_vcard(filename)
+    return read_csv(filename)
+
+
+# validated and normalized fields: name, phones, emails, birthday, address
+Valid = tuple[str, list[str], list[str], date | None, str | None]
+
+
+def validate_row(row: Row) -> tuple[int, Valid | None, str]:
+    """
+    Validates and normalizes fields of the row or returns the reason it was
+    rejected. Only plain values are returned, so results are cheap to send
+    back from worker processes.
+    """
+    line, fields = row
+    try:
+        name = Name(fields.get("name", "")).value
+        phones = [Phone(phone).value for phone in dict.fromkeys(fields["phones"])]
+        emails = list(dict.fromkeys(Email(email).value for email in fields["emails"]))
+        birthday = Birthday(fields["birthday"]).value if fields.get("birthday") else None
+        address = Address(fields["address"]).value if fields.get("address") else None
+    except NameFormatError:
+        return line, None, "Name cannot be blank"
+    except (PhoneFormatError, EmailFormatError, DateFormatError) as e:
+        return line, None, str(e.args[0]).removeprefix("[!]")
+    return line, (name, phones, emails, birthday, address), ""
+
+
+def build_record(valid: Valid) -> Record:
+    name, phones, emails, birthday, address = valid
+    record = Record(name)
+    record.phones = [Phone.trusted(phone) for phone in phones]
+    record.emails = [Email.trusted(email) for email in emails]
+    record.birthday = Birthday.trusted(birthday) if birthday else None
+    record.address = Address.trusted(address) if address else None
+    return record
+
+
+def validate_rows(rows: tuple[Row, ...]) -> list[tuple[int, Valid | None, str]]:
+    return [validate_row(row) for row in rows]
+
+
+def validated_batches(rows: Iterable[Row], batch_size: int, workers: int) -> Iterator[list]:
+    """
+    Validates batches of rows in a process pool, keeping only a few
+    batches in flight so the input is never read into memory as a whole
+    """
+    if workers <= 1:
+        for batch in batched(rows, batch_size):
+            yield validate_rows(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        for batch in batched(rows, batch_size):
+            pending.append(executor.submit(validate_rows, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_contacts(book: AddressBook, filename: str, *, batch_size: int = 1000,
+                    workers: int | None = None) -> ImportReport:
+    """
+    Imports contacts from a CSV or vCard file into the book. Rows with
+    invalid fields or names that already exist are skipped and reported.
+    """
+    report = ImportReport()
+    workers = workers if workers is not None else os.cpu_count() or 1
+
+    for batch in validated_batches(read_rows(filename), batch_size, workers):
+        for line, valid, error in batch:
+            if valid is None:
+                report.errors.append((line, error))
+                continue
+            record = build_record(valid)
+            if record.name.value in book:
+                report.errors.append((line, f"Contact {record.name.value} already exists"))
+            else:
+                try:
+                    book.add_record(record)
+                    report.imported += 1
+                except (PhoneExistsError, EmailExistsError) as e:
+                    report.errors.append((line, str(e)))
+
+    return report
@@ -1,36 +1,40 @@
 from collections.abc import Callable
+from importlib import import_module
 
 from app_context import AppContext
 
-from .birthdays_show import birthdays_show
+def lazy_command(name: str) -> Callable[[AppContext], None]:
+    """
+    Returns the command function of the module with the same name, the
+    module and its dependencies are imported when the command first runs
+    """
+    def command(context: AppContext) -> None:
+        return getattr(import_module(f".{name}", __name__), name)(context)
 
-from .contacts_add import contacts_add
-from .contacts_delete import contacts_delete
-from .contacts_edit import contacts_edit
-from .contacts_list import contacts_list
-from .contacts_search import contacts_search
-from .contacts_show import contacts_show
-from .notes_add import notes_add
-from .notes_delete import notes_delete
-from .notes_edit import notes_edit
-from .notes_list import notes_list
-from .notes_search import notes_search
-from .notes_show import notes_show
+    command.__name__ = name
+    return command
 
 COMMANDS: dict[str, Callable[[AppContext], None]] = {
-    'add contact': contacts_add,
-    'delete contact': contacts_delete,
-    'edit contact': contacts_edit,
-    'list contacts': contacts_list,
-    'search contacts': contacts_search,
-    'show contact': contacts_show,
+    'add contact': lazy_command('contacts_add'),
+    'delete contact': lazy_command('contacts_delete'),
+    'edit contact': lazy_command('contacts_edit'),
+    'list contacts': lazy_command('contacts_list'),
+    'search contacts': lazy_command('contacts_search'),
+    'show contact': lazy_command('contacts_show'),
+    'import contacts': lazy_command('contacts_import'),
+    'export contacts': lazy_command('contacts_export'),
 
-    'add note': notes_add,
-    'edit note': notes_edit,
-    'delete note': notes_delete,
-    'list notes': notes_list,
-    'search notes': notes_search,
-    'show notes': notes_show,
+    'add note': lazy_command('notes_add'),
+    'edit note': lazy_command('notes_edit'),
+    'delete note': lazy_command('notes_delete'),
+    'list notes': lazy_command('notes_list'),
+    'search notes': lazy_command('notes_search'),
+    'search text': lazy_command('notes_search_text'),
+    'show notes': lazy_command('notes_show'),
+    'export notes': lazy_command('notes_export'),
 
-    'show birthdays': birthdays_show,
+    'show birthdays': lazy_command('birthdays_show'),
+    'show analytics': lazy_command('birthdays_analytics'),
+
+    'show stats': lazy_command('stats_show'),
 }
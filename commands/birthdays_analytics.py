@@ -0,0 +1,17 @@
+from datetime import date
+
+from app_context import AppContext
+from birthday_analytics import BirthdayColumns
+
+def birthdays_analytics(context: AppContext):
+    """
+    Shows birthday statistics: who celebrates today and tomorrow, birthdays by month, weekday of birth and age
+    """
+    with context.state.lock:
+        columns = BirthdayColumns.from_book(context.state.book)
+
+    if len(columns) == 0:
+        context.interface.draw_info('No contacts with birthday')
+        return
+
+    context.interface.draw_analytics(columns.report(date.today()))
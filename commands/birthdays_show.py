@@ -8,16 +8,10 @@ def birthdays_show(context: AppContext):
     """
     range_int = int(get_birthday_range())
 
-    birthdays = context.state.book.get_upcoming_birthday(limit=range_int)
+    with context.state.lock:
+        birthdays = context.state.book.get_upcoming_birthday(limit=range_int)
 
     if birthdays:
-        text = ""
-        for person in birthdays:
-            text += (
-                f"Name: {person['name']}, "
-                f"Birthday: {person['birthday']}, "
-                f"Congratulation date: {person['congratulation_date']}"
-            )
-        print(text.strip())
+        context.interface.draw_birthdays(birthdays)
     else:
-        print("Birthdays not found")
+        context.interface.draw_info("Birthdays not found")
@@ -0,0 +1,23 @@
+from addressbook import Record
+from app_context import AppContext
+
+def lookup_contact(context: AppContext, name: str) -> Record | None:
+    """
+    Finds a contact by name, when there is no such contact offers the ones
+    with a similar name in case it was mistyped
+    """
+    with context.state.lock:
+        record = context.state.book.find(name)
+        if record is not None:
+            return record
+        similar = [record.name.value for record in context.state.book.find_similar(name)]
+
+    if not similar:
+        return None
+
+    choice = context.interface.prompt_select(f"Contact for {name} not found, did you mean",
+                                             [*similar, 'none'])
+    if choice not in similar:
+        return None
+    with context.state.lock:
+        return context.state.book.find(choice)
@@ -1,3 +1,4 @@
+from addressbook import EmailExistsError, PhoneExistsError
 from app_context import AppContext
 from ui import get_name, get_phone, get_email, get_birthday, get_address
 
@@ -7,7 +8,8 @@ def contacts_add(context: AppContext):
     """
     name = get_name()
 
-    record = context.state.book.find(name)
+    with context.state.lock:
+        record = context.state.book.find(name)
     if record:
         context.interface.draw_info(f"Contact for {name} already exists")
         return
@@ -19,16 +21,25 @@ def contacts_add(context: AppContext):
     birthday = get_birthday()
     address = get_address()
 
-    record = context.state.book.add(name)
+    with context.state.lock:
+        try:
+            context.state.book.check_unique(name,
+                                            phones=[phone] if phone else [],
+                                            emails=[email] if email else [])
+        except (PhoneExistsError, EmailExistsError) as e:
+            context.interface.draw_failure(str(e))
+            return
 
-    if phone:
-        record.add_phone(phone)
-    if email:
-        record.add_email(email)
-    if birthday:
-        record.set_birthday(birthday)
-    if address:
-        record.set_address(address)
+        record = context.state.book.add(name)
+
+        if phone:
+            record.add_phone(phone)
+        if email:
+            record.add_email(email)
+        if birthday:
+            record.set_birthday(birthday)
+        if address:
+            record.set_address(address)
 
     context.interface.draw_success("Contact saved")
     context.interface.draw_record(record)
@@ -1,22 +1,23 @@
-from prompt_toolkit.completion import WordCompleter
-
 from app_context import AppContext
+from interface import PrefixCompleter
 from ui import get_name
 
+from .contact_lookup import lookup_contact
+
 def contacts_delete(context: AppContext):
     """
     Deletes an existing contact
     """
-    name_completer = WordCompleter([name for name in context.state.book.keys()])
+    name_completer = PrefixCompleter(context.state.locked(context.state.book.complete_names))
 
     name = get_name(completer=name_completer)
 
-    record = context.state.book.find(name)
+    record = lookup_contact(context, name)
     if not record:
-        print(f"Contact for {name} not found")
+        context.interface.draw_failure(f"Contact for {name} not found")
         return
 
-    context.interface.draw_info(f"Found contact for {name}")
+    context.interface.draw_info(f"Found contact for {record.name.value}")
     context.interface.draw_record(record)
 
     should_delete = context.interface.prompt_confirm("Are you sure you want to delete this contact")
@@ -24,6 +25,7 @@ def contacts_delete(context: AppContext):
     if not should_delete:
         return
 
-    context.state.book.delete(name)
+    with context.state.lock:
+        context.state.book.delete(record.name.value)
 
     context.interface.draw_success("Contact deleted")
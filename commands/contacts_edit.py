@@ -1,9 +1,12 @@
 from prompt_toolkit.completion import WordCompleter
 
-from addressbook import Birthday, Email
+from addressbook import Birthday, Email, EmailExistsError, PhoneExistsError
 from app_context import AppContext
+from interface import PrefixCompleter
 from ui import get_name, get_phone, get_address, get_birthday, get_email
 
+from .contact_lookup import lookup_contact
+
 edit_sections = ['phones', 'emails', 'address', 'birthday']
 
 def contacts_edit(context: AppContext):
@@ -11,16 +14,16 @@ def contacts_edit(context: AppContext):
     Edits an existing contact
     """
 
-    name_completer = WordCompleter([name for name in context.state.book.keys()])
+    name_completer = PrefixCompleter(context.state.locked(context.state.book.complete_names))
 
     name = get_name(completer=name_completer)
 
-    record = context.state.book.find(name)
+    record = lookup_contact(context, name)
     if record is None:
         context.interface.draw_failure(f"Contact for {name} not found")
         return
 
-    context.interface.draw_success(f"Found contact for {name}")
+    context.interface.draw_success(f"Found contact for {record.name.value}")
     context.interface.draw_record(record)
 
     focus = context.interface.prompt_select('What do you want to edit',
@@ -34,23 +37,29 @@ def contacts_edit(context: AppContext):
             exists = len([phone for phone in record.phones if phone.value == phone_input]) > 0
 
             if exists:
-                print(f"Contact already has this phone")
+                context.interface.draw_info("Contact already has this phone")
 
                 should_delete = context.interface.prompt_confirm("Do you want to delete this phone from this contact")
 
                 if should_delete:
-                    record.remove_phone(phone_input)
+                    with context.state.lock:
+                        record.remove_phone(phone_input)
 
-                    print("✅Phone deleted from contact.")
+                    context.interface.draw_success("Phone deleted from contact.")
             else:
-                print(f"Contact does not have this phone")
+                context.interface.draw_info("Contact does not have this phone")
 
                 should_add = context.interface.prompt_confirm("Do you want to add this phone to this contact")
 
                 if should_add:
-                    record.add_phone(phone_input)
-
-                    print("✅Phone added to contact.")
+                    try:
+                        with context.state.lock:
+                            record.add_phone(phone_input)
+                    except PhoneExistsError as e:
+                        context.interface.draw_failure(str(e))
+                        return
+
+                    context.interface.draw_success("Phone added to contact.")
         case 'emails':
             email_input = get_email(label='Enter a new or existing email',
                                     completer=WordCompleter([email.value for email in record.emails]),
@@ -59,34 +68,42 @@ def contacts_edit(context: AppContext):
             exists = len([email for email in record.emails if email.value == email_input]) > 0
 
             if exists:
-                print(f"Contact already has this email")
+                context.interface.draw_info("Contact already has this email")
 
                 should_delete = context.interface.prompt_confirm("Do you want to delete this email from this contact")
 
                 if should_delete:
-                    record.remove_email(email_input)
+                    with context.state.lock:
+                        record.remove_email(email_input)
 
-                    print("✅Email deleted from contact.")
+                    context.interface.draw_success("Email deleted from contact.")
             else:
-                print(f"Contact does not have this phone")
+                context.interface.draw_info("Contact does not have this email")
 
                 should_delete = context.interface.prompt_confirm("Do you want to add this email to this contact")
 
                 if should_delete:
-                    record.add_email(email_input)
-
-                    print("✅Email added to contact.")
+                    try:
+                        with context.state.lock:
+                            record.add_email(email_input)
+                    except EmailExistsError as e:
+                        context.interface.draw_failure(str(e))
+                        return
+
+                    context.interface.draw_success("Email added to contact.")
         case 'address':
             address = get_address(label='Enter new address (leave blank to unset)')
 
-            record.set_address(address)
+            with context.state.lock:
+                record.set_address(address)
         case 'birthday':
             validator = lambda value: True if value == '' else Birthday.validate_date(value)
 
             birthday = get_birthday(label="Enter new birthday (leave blank to unset)",
                                     live_validator=validator)
 
-            record.set_birthday(birthday)
+            with context.state.lock:
+                record.set_birthday(birthday)
 
     context.interface.draw_success("Contact updated")
     context.interface.draw_record(record)
@@ -0,0 +1,25 @@
+from addressbook import Record
+from app_context import AppContext
+from bulk_export import export_contacts
+from ui import get_path, validated_prompt
+
+get_filter = validated_prompt("Export only contacts matching (optional)", optional=True)
+get_days = validated_prompt("Export only birthdays in next N days (optional)",
+                            validator=Record.validate_range, optional=True)
+
+def contacts_export(context: AppContext):
+    """
+    Exports contacts to a .csv, .jsonl or .vcf file, optionally only those matching a search term or with upcoming birthdays
+    """
+    path = get_path(label="Enter path to a .csv, .jsonl or .vcf file")
+    term = get_filter()
+    days = get_days()
+
+    try:
+        with context.state.lock:
+            count = export_contacts(context.state.book, path, term=term, days=int(days) if days else None)
+    except (ValueError, OSError) as e:
+        context.interface.draw_failure(str(e))
+        return
+
+    context.interface.draw_success(f"Exported {count} contacts to {path}")
@@ -0,0 +1,27 @@
+import os
+
+from app_context import AppContext
+from bulk_import import import_contacts
+from ui import get_path
+
+def contacts_import(context: AppContext):
+    """
+    Imports contacts from a CSV (name, phones, emails, birthday, address columns) or vCard file
+    """
+    path = get_path(label="Enter path to a .csv or .vcf file")
+
+    if not os.path.isfile(path):
+        context.interface.draw_failure(f"File {path} not found")
+        return
+
+    with context.state.lock:
+        report = import_contacts(context.state.book, path)
+
+    context.interface.draw_success(f"Imported {report.imported} contacts")
+
+    if report.errors:
+        errors_path = f"{path}.errors.csv"
+        report.write_errors(errors_path)
+        context.interface.draw_warning(f"Skipped {len(report.errors)} rows, see {errors_path}")
+        for line, error in report.errors[:10]:
+            context.interface.draw_failure(f"Line {line}: {error}")
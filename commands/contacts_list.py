@@ -5,9 +5,11 @@ def contacts_list(context: AppContext):
     Lists all the contacts in the address book
     """
 
-    records = context.state.book.list_records()
+    book = context.state.book
+    with context.state.lock:
+        total = len(book)
 
-    if len(records) == 0:
+    if total == 0:
         context.interface.draw_info('Contacts not found')
     else:
-        context.interface.draw_records(records, 'All contacts')
+        context.interface.draw_records_paged(total, context.state.locked(book.records_page), 'All contacts')
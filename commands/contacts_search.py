@@ -11,11 +11,12 @@ def contacts_search(context: AppContext):
     if term is None:
         return
 
-    records = [record for record in context.state.book.values() if record.check(term)]
+    with context.state.lock:
+        records = context.state.book.search(term)
 
     context.interface.draw_info(f"Found {len(records)} contacts")
 
     if len(records) == 0:
         return
 
-    context.interface.draw_records(records)
+    context.interface.draw_records_paged(len(records), lambda start, count: records[start:start + count])
@@ -1,12 +1,14 @@
 from app_context import AppContext
 from ui import get_name
 
+from .contact_lookup import lookup_contact
+
 def contacts_show(context: AppContext):
     """
     Show a single contact in a card view
     """
     name = get_name()
-    record = context.state.book.find(name)
+    record = lookup_contact(context, name)
     if record:
         context.interface.draw_record(record)
     else:
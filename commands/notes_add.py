@@ -1,26 +1,34 @@
 from app_context import AppContext
+from notes import NoteExistsError, TitleFormatError
+from ui import ask
 
 
 def notes_add(context: AppContext):
     """
     Add a new note
     """
-    title = input("Enter note title: ")
+    title = ask("Enter note title: ")
 
-    note = context.state.notes.find_note_by_title(title)
+    with context.state.lock:
+        note = context.state.notes.find_note_by_title(title)
 
     if note is not None:
         context.interface.draw_failure('Note with this title already exists')
         return
 
-    content = input("Enter note content: ")
+    content = ask("Enter note content: ", optional=True)
     tags = [
         tag.strip()
-        for tag in input("Enter tags (comma separated): ").split(",")
+        for tag in ask("Enter tags (comma separated): ", optional=True).split(",")
         if tag.strip()
     ]
 
-    note = context.state.notes.add_note(title, content, tags)
+    try:
+        with context.state.lock:
+            note = context.state.notes.add_note(title, content, tags)
+    except (NoteExistsError, TitleFormatError) as e:
+        context.interface.draw_failure(str(e))
+        return
 
     context.interface.draw_success('Note added')
 
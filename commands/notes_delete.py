@@ -1,12 +1,14 @@
 from app_context import AppContext
+from ui import ask
 
 def notes_delete(context: AppContext):
     """
     Delete an existing note
     """
-    title = input("Enter the title of the note you want to remove: ")
+    title = ask("Enter the title of the note you want to remove: ")
 
-    note = context.state.notes.find_note_by_title(title)
+    with context.state.lock:
+        note = context.state.notes.find_note_by_title(title)
 
     if not note:
         context.interface.draw_failure("Note not found")
@@ -14,9 +16,15 @@ def notes_delete(context: AppContext):
 
     context.interface.draw_note(note)
 
-    should_delete = context.interface.prompt_confirm("Are you sure you want to delete this contact")
+    should_delete = context.interface.prompt_confirm("Are you sure you want to delete this note")
 
-    if should_delete:
+    if not should_delete:
+        return
+
+    with context.state.lock:
+        removed = context.state.notes.remove_note(note)
+    if not removed:
+        context.interface.draw_failure("Note not found")
         return
 
     context.interface.draw_success('Note removed')
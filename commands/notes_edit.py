@@ -1,25 +1,36 @@
 from app_context import AppContext
+from notes import NoteExistsError, TitleFormatError
+from ui import ask
 
 def notes_edit(context: AppContext):
     """
     Edit an existing note
     """
 
-    title = input("Enter the title of the note you want to edit: ")
+    title = ask("Enter the title of the note you want to edit: ")
 
-    note = context.state.notes.find_note_by_title(title)
+    with context.state.lock:
+        note = context.state.notes.find_note_by_title(title)
 
     if not note:
         context.interface.draw_failure('Note not found')
+        return
 
-    new_title = input(f"Enter new title (current: {note.title}): ")
-    new_content = input(f"Enter new content (current: {note.content}): ")
+    new_title = ask(f"Enter new title (current: {note.title}): ")
+    new_content = ask(f"Enter new content (current: {note.content}): ", optional=True)
     new_tags = [
         tag.strip()
-        for tag in input(
-            f"Enter new tags (current: {', '.join(note.tags)}): "
+        for tag in ask(
+            f"Enter new tags (current: {', '.join(note.tags)}): ", optional=True
         ).split(",")
         if tag.strip()
     ]
-    context.state.notes.edit_note(note, new_title, new_content, new_tags)
+    try:
+        with context.state.lock:
+            context.state.notes.edit_note(note, new_title, new_content, new_tags)
+    except (NoteExistsError, TitleFormatError) as e:
+        context.interface.draw_failure(str(e))
+        return
+
+    context.interface.draw_success('Note updated')
     context.interface.draw_note(note)
@@ -0,0 +1,21 @@
+from app_context import AppContext
+from bulk_export import export_notes
+from ui import get_path, validated_prompt
+
+get_tag = validated_prompt("Export only notes with tag (optional)", optional=True)
+
+def notes_export(context: AppContext):
+    """
+    Exports notes to a .csv or .jsonl file, optionally only those with a matching tag
+    """
+    path = get_path(label="Enter path to a .csv or .jsonl file")
+    tag = get_tag()
+
+    try:
+        with context.state.lock:
+            count = export_notes(context.state.notes, path, tag=tag)
+    except (ValueError, OSError) as e:
+        context.interface.draw_failure(str(e))
+        return
+
+    context.interface.draw_success(f"Exported {count} notes to {path}")
@@ -4,8 +4,9 @@ def notes_list(context: AppContext):
     """
     List all the notes
     """
-    notes = context.state.notes.get_all_notes()
+    with context.state.lock:
+        notes = context.state.notes.get_all_notes()
     if notes:
-        context.interface.draw_notes(notes)
+        context.interface.draw_notes_paged(len(notes), lambda start, count: notes[start:start + count])
     else:
         context.interface.draw_info('No notes found')
@@ -1,21 +1,17 @@
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-
 from app_context import AppContext
+from interface import PrefixCompleter
+from ui import get_tag
 
 def notes_search(context: AppContext):
     """
     Searches through notes for matches on tags
     """
-    tag_completer = WordCompleter(
-        context.state.notes.get_autocomplete_words(), ignore_case=True
-    )
-    session = PromptSession(completer=tag_completer)
-
-    search_term = session.prompt("🔍Enter the tag to search for: ").strip()
-    notes = context.state.notes.search_notes_by_tags(search_term)
+    tag_completer = PrefixCompleter(context.state.locked(context.state.notes.complete_words))
+    search_term = get_tag(completer=tag_completer)
+    with context.state.lock:
+        notes = context.state.notes.search_notes_by_tags(search_term)
 
     if notes:
-        context.interface.draw_notes(notes)
+        context.interface.draw_notes_paged(len(notes), lambda start, count: notes[start:start + count])
     else:
         context.interface.draw_info('No matching notes found by tag')
@@ -0,0 +1,20 @@
+from app_context import AppContext
+
+from ui import get_term
+
+def notes_search_text(context: AppContext):
+    """
+    Searches through titles, tags and content of notes and shows the best matches first
+    """
+    query = get_term(label='Enter words, "a phrase" or a prefix*')
+
+    if not query:
+        return
+
+    with context.state.lock:
+        notes = context.state.notes.search_notes(query)
+
+    if notes:
+        context.interface.draw_notes_paged(len(notes), lambda start, count: notes[start:start + count])
+    else:
+        context.interface.draw_info('No matching notes found')
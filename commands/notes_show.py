@@ -1,12 +1,14 @@
 from app_context import AppContext
+from ui import ask
 
 def notes_show(context: AppContext):
     """
     Show an existing note in a card view
     """
-    title = input("Enter note title: ")
+    title = ask("Enter note title: ")
 
-    note = context.state.notes.find_note_by_title(title)
+    with context.state.lock:
+        note = context.state.notes.find_note_by_title(title)
 
     if note is None:
         context.interface.draw_failure('Note with this title does not exist')
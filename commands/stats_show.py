@@ -0,0 +1,14 @@
+from app_context import AppContext
+from instrumentation import stats
+
+def stats_show(context: AppContext):
+    """
+    Shows latencies of the commands, store operations and rendering in this session
+    """
+    report = stats.report()
+
+    if not report:
+        context.interface.draw_info('Nothing measured yet')
+        return
+
+    context.interface.draw_stats(report)
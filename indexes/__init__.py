@@ -0,0 +1,7 @@
+from .birthday_index import BirthdayIndex
+from .fulltext_index import FullTextIndex
+from .fuzzy_index import FuzzyIndex
+from .key_index import KeyIndex
+from .prefix_index import PrefixIndex
+from .tag_index import TagIndex
+from .trigram_index import TrigramIndex
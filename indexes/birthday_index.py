@@ -0,0 +1,50 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterator
+
+class BirthdayIndex:
+    """
+    Calendar of record names bucketed by birthday key (month and day of
+    birth, see `addressbook.birthday_key`). The keys of non-empty buckets
+    are kept sorted, so a window of days is a range scan over at most 366
+    buckets.
+    """
+
+    def __init__(self, key: Callable[[object], int | None]):
+        self.key = key
+        self.buckets: dict[int, set[str]] = {}
+        self.sorted_keys: list[int] = []
+        self.keys: dict[str, int] = {}
+
+    def update(self, op: str, key: str, record) -> None:
+        """
+        Store observer, re-indexes a record after it was put or deleted
+        """
+        old_day = self.keys.pop(key, None)
+        new_day = self.key(record) if op == "put" else None
+        if new_day is not None:
+            self.keys[key] = new_day
+        if old_day == new_day:
+            return
+
+        if old_day is not None:
+            bucket = self.buckets[old_day]
+            bucket.discard(key)
+            if not bucket:
+                del self.buckets[old_day]
+                del self.sorted_keys[bisect_left(self.sorted_keys, old_day)]
+
+        if new_day is not None:
+            bucket = self.buckets.get(new_day)
+            if bucket is None:
+                bucket = self.buckets[new_day] = set()
+                insort(self.sorted_keys, new_day)
+            bucket.add(key)
+
+    def between(self, low: int, high: int) -> Iterator[str]:
+        """
+        Yields names with birthday keys in the inclusive range, ordered by day
+        """
+        start = bisect_left(self.sorted_keys, low)
+        stop = bisect_right(self.sorted_keys, high)
+        for day in self.sorted_keys[start:stop]:
+            yield from sorted(self.buckets[day])
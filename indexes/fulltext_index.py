@@ -0,0 +1,130 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+TOKEN = re.compile(r"\w+")
+QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+# positions of different fields are this far apart, so phrases never span two fields
+FIELD_GAP = 1000
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+class FullTextIndex:
+    """
+    Positional inverted index over title, tags and content of notes with
+    BM25 ranking.
+
+    A query is a list of words, "quoted phrases" and prefix* words; notes
+    matching any of them are ranked by the sum of their BM25 scores.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, key):
+        self.key = key
+        self.postings: dict[str, dict[object, list[int]]] = {}
+        self.vocabulary: list[str] = []
+        self.lengths: dict[object, int] = {}
+        self.total_length = 0
+        self.docs: dict[str, tuple[object, tuple[str, ...]]] = {}
+
+    def update(self, op: str, key: str, note) -> None:
+        """
+        Store observer, re-indexes a note after it was put or deleted under
+        the key of its previous title
+        """
+        entry = self.docs.pop(key, None)
+        if entry is not None:
+            self.__remove(*entry)
+        if op == "put":
+            self.__add(note)
+
+    def __add(self, note) -> None:
+        positions: dict[str, list[int]] = {}
+        length = 0
+        for field_number, field in enumerate((note.title, " ".join(note.tags), note.content)):
+            tokens = tokenize(field)
+            for position, token in enumerate(tokens, start=field_number * FIELD_GAP):
+                positions.setdefault(token, []).append(position)
+            length += len(tokens)
+
+        for token, token_positions in positions.items():
+            docs = self.postings.get(token)
+            if docs is None:
+                docs = self.postings[token] = {}
+                insort(self.vocabulary, token)
+            docs[note] = token_positions
+
+        self.lengths[note] = length
+        self.total_length += length
+        self.docs[self.key(note.title)] = (note, tuple(positions))
+
+    def __remove(self, note, tokens: tuple[str, ...]) -> None:
+        for token in tokens:
+            docs = self.postings[token]
+            docs.pop(note, None)
+            if not docs:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+        self.total_length -= self.lengths.pop(note, 0)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Returns up to `limit` best matching notes, best first
+        """
+        scores: dict[object, float] = {}
+        for phrase, word in QUERY_PART.findall(query):
+            if word.endswith("*") and len(word) > 1:
+                for token in self.__expand(word[:-1].lower()):
+                    self.__score(scores, self.postings[token])
+                continue
+            tokens = tokenize(phrase or word)
+            if len(tokens) == 1:
+                self.__score(scores, self.postings.get(tokens[0], {}))
+            elif tokens:
+                self.__score(scores, self.__phrase(tokens))
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [note for note, _ in best]
+
+    def __expand(self, prefix: str) -> list[str]:
+        start = bisect_left(self.vocabulary, prefix)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def __phrase(self, tokens: list[str]) -> dict[object, list[int]]:
+        """
+        Returns notes containing the tokens next to each other, with the
+        positions where the phrase starts
+        """
+        postings = [self.postings.get(token, {}) for token in tokens]
+        rarest = min(postings, key=len)
+        matches = {}
+        for note in rarest:
+            if not all(note in docs for docs in postings):
+                continue
+            following = [set(docs[note]) for docs in postings[1:]]
+            starts = [
+                position for position in postings[0][note]
+                if all(position + offset in positions for offset, positions in enumerate(following, start=1))
+            ]
+            if starts:
+                matches[note] = starts
+        return matches
+
+    def __score(self, scores: dict, docs: dict[object, list[int]]) -> None:
+        count = len(self.lengths)
+        if not docs or not count:
+            return
+        idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+        average_length = self.total_length / count or 1
+        for note, positions in docs.items():
+            frequency = len(positions)
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[note] / average_length)
+            scores[note] = scores.get(note, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
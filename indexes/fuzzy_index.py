@@ -0,0 +1,129 @@
+# trigrams a candidate has to share with the query, with fewer a short
+# query would pull in every name starting with the same letter
+MIN_SHARED = 2
+# queries up to this long get at most one typo, found through the
+# single-letter deletions of the short names
+SHORT_QUERY = 3
+
+def padded_trigrams(word: str) -> list[str]:
+    padded = f"  {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def deletions(word: str) -> set[str]:
+    """
+    The word and every word one letter shorter, two words within one edit
+    of each other share one of these
+    """
+    return {word, *(word[:i] + word[i + 1:] for i in range(len(word)))}
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Levenshtein distance of a and b, or bound + 1 as soon as it is known
+    to be greater than the bound
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
+
+class FuzzyIndex:
+    """
+    Finds names within an edit distance of a misspelled one.
+
+    A single edit changes at most three trigrams of a padded name, so a
+    name within distance k of the query shares all but 3k of its trigrams.
+    Candidates come from the postings of the rarest trigrams of the query,
+    only those sharing enough trigrams are compared letter by letter.
+
+    Short queries allow fewer typos, so that candidates still share at least
+    MIN_SHARED trigrams. Those too short for that are looked up as a prefix
+    of the name; up to SHORT_QUERY letters they also match names one typo
+    away, found by the deletions of the query among those of short names.
+    """
+
+    def __init__(self):
+        self.postings: dict[str, set[str]] = {}
+        # deletions of names of up to SHORT_QUERY + 1 letters to the names
+        self.short: dict[str, set[str]] = {}
+
+    def update(self, op: str, key: str, record) -> None:
+        """
+        Store observer, names never change, so records are only added or removed
+        """
+        grams = set(padded_trigrams(key.lower()))
+        short = len(key) <= SHORT_QUERY + 1
+        if op == "put":
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(key)
+            if short:
+                for word in deletions(key.lower()):
+                    self.short.setdefault(word, set()).add(key)
+        else:
+            for gram in grams:
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[gram]
+            if short:
+                for word in deletions(key.lower()):
+                    keys = self.short.get(word)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self.short[word]
+
+    def search(self, name: str, max_distance: int = 2, limit: int = 5) -> list[tuple[int, str]]:
+        """
+        Returns up to `limit` (distance, name) pairs, closest first
+        """
+        name = name.strip().lower()
+        postings = sorted((self.postings.get(gram, set()) for gram in set(padded_trigrams(name))), key=len)
+
+        trigram_distance = min(max_distance, (len(postings) - MIN_SHARED) // 3)
+        if trigram_distance <= 0:
+            return self.__search_short(name, min(max_distance, 1), limit)
+        max_distance = trigram_distance
+        minimum = len(postings) - 3 * max_distance
+
+        # a name sharing `minimum` trigrams has at least one of the rarest
+        # len - minimum + 1 of them, other postings are only checked
+        candidates = set().union(*postings[:len(postings) - minimum + 1])
+        found = []
+        for key in candidates:
+            if sum(key in keys for keys in postings) < minimum:
+                continue
+            distance = edit_distance(name, key.lower(), max_distance)
+            if distance <= max_distance:
+                found.append((distance, key))
+        found.sort()
+        return found[:limit]
+
+    def __search_short(self, name: str, max_distance: int, limit: int) -> list[tuple[int, str]]:
+        """
+        Names starting with the query, at the distance of the letters they
+        add to it, and short names within `max_distance` typos of it
+        """
+        if not name:
+            return []
+        # all trigrams but the one ending the padded query are in a name starting with it
+        postings = sorted((self.postings.get(gram, set()) for gram in set(padded_trigrams(name)[:-1])), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        found = {key: len(key) - len(name) for key in candidates if key.lower().startswith(name)}
+
+        if max_distance and len(name) <= SHORT_QUERY:
+            for word in deletions(name):
+                for key in self.short.get(word, ()):
+                    distance = edit_distance(name, key.lower(), 1)
+                    if distance <= 1 and distance < found.get(key, distance + 1):
+                        found[key] = distance
+        return sorted((distance, key) for key, distance in found.items())[:limit]
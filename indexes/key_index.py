@@ -0,0 +1,55 @@
+from collections.abc import Callable, Iterable
+
+class KeyIndex:
+    """
+    Maps normalized values of a record field (phones, emails) to the names
+    of records having them.
+
+    Most values have a single owner, so it is stored as a plain string and
+    only additional owners of the same value go to a separate set.
+    """
+
+    def __init__(self, values: Callable[[object], Iterable[str]]):
+        self.values = values
+        self.owners: dict[str, str] = {}
+        self.extra_owners: dict[str, set[str]] = {}
+        self.keys: dict[str, tuple[str, ...]] = {}
+
+    def update(self, op: str, key: str, record) -> None:
+        """
+        Store observer, re-indexes a record after it was put or deleted
+        """
+        old_values = self.keys.pop(key, ())
+        new_values = tuple(self.values(record)) if op == "put" else ()
+        if new_values:
+            self.keys[key] = new_values
+        if old_values == new_values:
+            return
+
+        for value in set(old_values) - set(new_values):
+            self.__remove(value, key)
+        for value in set(new_values) - set(old_values):
+            self.__add(value, key)
+
+    def find(self, value: str) -> list[str]:
+        owner = self.owners.get(value)
+        if owner is None:
+            return []
+        return [owner, *sorted(self.extra_owners.get(value, ()))]
+
+    def __add(self, value: str, key: str) -> None:
+        owner = self.owners.setdefault(value, key)
+        if owner != key:
+            self.extra_owners.setdefault(value, set()).add(key)
+
+    def __remove(self, value: str, key: str) -> None:
+        extra = self.extra_owners.get(value)
+        if self.owners.get(value) == key:
+            if extra:
+                self.owners[value] = extra.pop()
+            else:
+                del self.owners[value]
+        elif extra:
+            extra.discard(key)
+        if extra is not None and not extra:
+            del self.extra_owners[value]
@@ -0,0 +1,97 @@
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+
+class PrefixIndex:
+    """
+    Completes words (names, titles, tags) by a case-insensitive prefix.
+
+    Lowercased words are kept in a sorted list, so a completion is one
+    binary search plus a walk over the `limit` words that follow it.
+    Words added while nothing is being completed are sorted in on the
+    next completion, so building the index from a large store is a single
+    sort instead of an insert per word.
+
+    Words are filed under the key a value was put under, or under `key(value)`
+    for stores reporting changes under the previous key (notes by title).
+    """
+
+    def __init__(self, words: Callable[[str, object], Iterable[str]] = None,
+                 key: Callable[[object], str] = None):
+        self.words = words
+        self.key = key
+        self.sorted_keys: list[str] = []
+        self.pending: list[str] = []
+        self.variants: dict[str, dict[str, int]] = {}
+        self.keys: dict[str, tuple[str, ...]] = {}
+
+    def update(self, op: str, key: str, value) -> None:
+        """
+        Store observer, re-indexes words of a value after it was put or
+        deleted under the key
+        """
+        old_words = self.keys.pop(key, ())
+        new_words = tuple(dict.fromkeys(self.words(key, value))) if op == "put" else ()
+        if new_words:
+            self.keys[self.key(value) if self.key else key] = new_words
+        if old_words == new_words:
+            return
+
+        for word in old_words:
+            self.remove(word)
+        for word in new_words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        lowered = word.lower()
+        variants = self.variants.get(lowered)
+        if variants is None:
+            variants = self.variants[lowered] = {}
+            self.pending.append(lowered)
+        variants[word] = variants.get(word, 0) + 1
+
+    def remove(self, word: str) -> None:
+        lowered = word.lower()
+        variants = self.variants.get(lowered)
+        if variants is None or word not in variants:
+            return
+        variants[word] -= 1
+        if variants[word]:
+            return
+        del variants[word]
+        if not variants:
+            del self.variants[lowered]
+            self.__sort_pending()
+            del self.sorted_keys[bisect_left(self.sorted_keys, lowered)]
+
+    def __sort_pending(self) -> None:
+        if len(self.pending) < 64:
+            for lowered in self.pending:
+                insort(self.sorted_keys, lowered)
+        else:
+            self.sorted_keys.extend(self.pending)
+            self.sorted_keys.sort()
+        self.pending = []
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Returns up to `limit` words starting with the prefix in alphabetical order
+        """
+        if self.pending:
+            self.__sort_pending()
+        prefix = prefix.lower()
+        completions = []
+        position = bisect_left(self.sorted_keys, prefix)
+        while position < len(self.sorted_keys) and len(completions) < limit:
+            lowered = self.sorted_keys[position]
+            if not lowered.startswith(prefix):
+                break
+            completions.extend(sorted(self.variants[lowered]))
+            position += 1
+        return completions[:limit]
+
+    def __iter__(self):
+        for variants in self.variants.values():
+            yield from variants
+
+    def __len__(self) -> int:
+        return len(self.variants)
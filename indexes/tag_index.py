@@ -0,0 +1,54 @@
+import bisect
+
+
+class TagIndex:
+    """
+    Inverted index from lowercased tags to the notes having them, the tags
+    are also kept sorted to find the ones starting with a prefix
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.postings: dict[str, set] = {}
+        self.tags: dict[str, tuple] = {}
+        self.sorted_tags: list[str] = []
+
+    def update(self, op: str, key: str, note) -> None:
+        """
+        Store observer, re-indexes a note after it was put or deleted under
+        the key of its previous title
+        """
+        entry = self.tags.pop(key, None)
+        if entry is not None:
+            old_note, old_tags = entry
+            for tag in old_tags:
+                notes = self.postings[tag]
+                notes.discard(old_note)
+                if not notes:
+                    del self.postings[tag]
+                    del self.sorted_tags[bisect.bisect_left(self.sorted_tags, tag)]
+
+        if op == "put":
+            new_tags = tuple({tag.lower() for tag in note.tags})
+            self.tags[self.key(note.title)] = (note, new_tags)
+            for tag in new_tags:
+                if tag not in self.postings:
+                    self.postings[tag] = set()
+                    bisect.insort(self.sorted_tags, tag)
+                self.postings[tag].add(note)
+
+    def find(self, tag: str) -> set:
+        return self.postings.get(tag.lower(), set())
+
+    def search(self, term: str) -> set:
+        """
+        Returns notes having a tag that starts with the term
+        """
+        term = term.lower()
+        start = bisect.bisect_left(self.sorted_tags, term)
+        found = set()
+        for tag in self.sorted_tags[start:]:
+            if not tag.startswith(term):
+                break
+            found |= self.postings[tag]
+        return found
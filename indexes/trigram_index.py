@@ -0,0 +1,57 @@
+from collections.abc import Iterable
+
+def trigrams(fields: Iterable[str]) -> set[str]:
+    return {field[i:i + 3] for field in fields for i in range(len(field) - 2)}
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams of searchable record fields to record names.
+
+    Any substring of at least three characters shares all of its trigrams
+    with the field it comes from, so intersecting the postings of the term's
+    trigrams gives a small set of candidates that only has to be verified.
+    """
+
+    def __init__(self):
+        self.postings: dict[str, set[str]] = {}
+        self.fields: dict[str, tuple[str, ...]] = {}
+
+    def update(self, op: str, key: str, record) -> None:
+        """
+        Store observer, re-indexes a record after it was put or deleted
+        """
+        old_fields = self.fields.pop(key, ())
+        new_fields = tuple(record.search_fields()) if op == "put" else ()
+        if new_fields:
+            self.fields[key] = new_fields
+        if old_fields == new_fields:
+            return
+
+        old_grams = trigrams(old_fields)
+        new_grams = trigrams(new_fields)
+
+        for gram in old_grams - new_grams:
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+        for gram in new_grams - old_grams:
+            self.postings.setdefault(gram, set()).add(key)
+
+    def candidates(self, term: str) -> set[str] | None:
+        """
+        Returns names of records that may contain the term or None when the
+        term is too short to be looked up in the index
+        """
+        grams = trigrams([term])
+        if not grams:
+            return None
+
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for keys in postings[1:]:
+            if not result:
+                break
+            result &= keys
+        return result
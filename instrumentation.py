@@ -0,0 +1,127 @@
+import inspect
+import json
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from functools import wraps
+
+# latest latencies kept per operation to compute the percentiles from
+SAMPLES = 10_000
+
+BOOK_OPERATIONS = ["add", "add_record", "find", "find_similar", "delete", "search", "find_by_phone",
+                   "find_by_email", "get_upcoming_birthday", "records_page", "complete_names"]
+NOTES_OPERATIONS = ["add_note", "edit_note", "remove_note", "find_note_by_title", "search_notes_by_tags",
+                    "search_notes", "complete_words"]
+
+
+class Metric:
+    __slots__ = ("count", "total", "blocks", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.blocks = 0
+        self.samples: deque[float] = deque(maxlen=SAMPLES)
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class Stats:
+    """
+    Latencies, call counts and allocation deltas of named operations.
+
+    Allocations are the change of `sys.getallocatedblocks()`, i.e. memory
+    blocks still held after the call, counted across all threads.
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, blocks: int) -> None:
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric()
+            metric.count += 1
+            metric.total += seconds
+            metric.blocks += blocks
+            metric.samples.append(seconds)
+
+    @contextmanager
+    def measure(self, name: str):
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, sys.getallocatedblocks() - blocks)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        @wraps(fn)
+        def measured(*args, **kwargs):
+            with self.measure(name):
+                return fn(*args, **kwargs)
+
+        measured.__instrumented__ = True
+        return measured
+
+    def instrument_class(self, cls: type, prefix: str, names: Iterable[str]) -> None:
+        """
+        Measures calls of the methods of the class, ones it does not have are skipped
+        """
+        for name in names:
+            if not hasattr(cls, name) or getattr(getattr(cls, name), "__instrumented__", False):
+                continue
+            method = inspect.getattr_static(cls, name)
+            if isinstance(method, staticmethod):
+                setattr(cls, name, staticmethod(self.wrap(f"{prefix}.{name}", method.__func__)))
+            else:
+                setattr(cls, name, self.wrap(f"{prefix}.{name}", getattr(cls, name)))
+
+    def report(self) -> dict[str, dict]:
+        """
+        Per operation: count, latency percentiles and total in milliseconds,
+        average allocated blocks per call
+        """
+        with self.lock:
+            metrics = [(name, metric, sorted(metric.samples)) for name, metric in self.metrics.items()]
+
+        return {
+            name: {
+                "count": metric.count,
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+                "total_ms": round(metric.total * 1000, 3),
+                "alloc_blocks": round(metric.blocks / metric.count, 1),
+            }
+            for name, metric, ordered in sorted(metrics, key=lambda item: item[0])
+        }
+
+    def dump(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+stats = Stats()
+
+
+def instrument_app(context) -> None:
+    """
+    Measures store operations, persistence and rendering of the app, command
+    dispatch is measured by the loop running the commands
+    """
+    from app_state import AppState
+
+    stats.instrument_class(AppState, "state", ["save", "close"])
+    stats.instrument_class(type(context.state.book), "book", BOOK_OPERATIONS)
+    stats.instrument_class(type(context.state.notes), "notes", NOTES_OPERATIONS)
+    interface = type(context.interface)
+    stats.instrument_class(interface, "render", [name for name in dir(interface) if name.startswith("draw_")])
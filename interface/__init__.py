@@ -1,3 +1,17 @@
-from .app_interface import AppInterface
+from importlib import import_module
 
-from .prompt_command import prompt_command
+# rich and prompt_toolkit are slow to import, so parts of the interface
+# are only imported when they are first used
+EXPORTS = {
+    'AppInterface': 'app_interface',
+    'MachineInterface': 'machine_interface',
+    'OUTPUT_FORMATS': 'machine_interface',
+    'PrefixCompleter': 'prefix_completer',
+    'prompt_command': 'prompt_command',
+}
+
+def __getattr__(name: str):
+    module = EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
@@ -1,42 +1,83 @@
-from rich.console import Console
+from collections.abc import Callable
 
 from addressbook import Record
 from notes import Note
 
-from .draw_header import draw_header
-from .draw_note import draw_note
-from .draw_notes import draw_notes
-from .draw_record import draw_record
-from .draw_records import draw_records
-from .prompt_command import prompt_command
-from .prompt_confirm import prompt_confirm
-from .prompt_select import prompt_select
-
 class AppInterface:
     """
     This class is responsible for UI of the bot,
-    providing methods for input and output of information
+    providing methods for input and output of information.
+
+    rich and prompt_toolkit take most of the startup time, so the drawing
+    and prompting modules are imported by the methods using them.
     """
 
     def __init__(self):
+        from rich.console import Console
+
         self.console = Console()
-        pass
+
+    @property
+    def page_size(self) -> int:
+        # leaves room for the table title, header, borders and the page prompt
+        return max(5, self.console.size.height - 8)
 
     def draw_header(self, commands: list[str]):
+        from .draw_header import draw_header
+
         draw_header(self.console, commands)
 
     def draw_note(self, note: Note) -> None:
+        from .draw_note import draw_note
+
         draw_note(self.console, note)
 
     def draw_notes(self, notes: list[Note]) -> None:
+        from .draw_notes import draw_notes
+
         draw_notes(self.console, notes)
 
     def draw_record(self, record: Record) -> None:
+        from .draw_record import draw_record
+
         draw_record(self.console, record)
 
     def draw_records(self, records: list[Record], title="Found contacts") -> None:
+        from .draw_records import draw_records
+
         draw_records(self.console, records, title)
 
+    def draw_records_paged(self, total: int, fetch: Callable[[int, int], list[Record]],
+                           title="Found contacts") -> None:
+        from .draw_records import draw_records
+        from .pager import page_through
+
+        page_through(total, self.page_size, fetch,
+                     lambda records, caption: draw_records(self.console, records, title, caption))
+
+    def draw_notes_paged(self, total: int, fetch: Callable[[int, int], list[Note]]) -> None:
+        from .draw_notes import draw_notes
+        from .pager import page_through
+
+        page_through(total, self.page_size, fetch,
+                     lambda notes, caption: draw_notes(self.console, notes, caption))
+
+    def draw_analytics(self, report: dict) -> None:
+        from .draw_analytics import draw_analytics
+
+        draw_analytics(self.console, report)
+
+    def draw_stats(self, report: dict[str, dict]) -> None:
+        from .draw_stats import draw_stats
+
+        draw_stats(self.console, report)
+
+    def draw_birthdays(self, birthdays: list[dict]) -> None:
+        for person in birthdays:
+            print(f"Name: {person['name']}, "
+                  f"Birthday: {person['birthday']}, "
+                  f"Congratulation date: {person['congratulation_date']}")
+
     def draw_info(self, message: str):
         print(f"ℹ️{message}")
 
@@ -50,10 +91,16 @@ class AppInterface:
         print(f"✅{message}")
 
     def prompt_command(self):
+        from .prompt_command import prompt_command
+
         return prompt_command()
 
     def prompt_select(self, message: str, options: list[str]):
+        from .prompt_select import prompt_select
+
         return prompt_select(message, options)
 
     def prompt_confirm(self, message: str):
+        from .prompt_confirm import prompt_confirm
+
         return prompt_confirm(message)
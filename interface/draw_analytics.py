@@ -0,0 +1,24 @@
+from rich.columns import Columns
+from rich.console import Console
+from rich.table import Table
+
+def draw_counts(title: str, counts: dict[str, int]) -> Table:
+    table = Table(title=title)
+    table.add_column("", style="bold cyan")
+    table.add_column("Contacts", justify="right", style="green")
+    for label, count in counts.items():
+        table.add_row(label, str(count))
+    return table
+
+def draw_analytics(console: Console, report: dict) -> None:
+    """
+    Displays birthday statistics of the address book in console
+    """
+    console.print(f"[bold magenta]🎂 Contacts with birthday: {report['total']}[/bold magenta]")
+    console.print(f"[cyan]Today:[/cyan] {', '.join(report['today']) or '-'}")
+    console.print(f"[cyan]Tomorrow:[/cyan] {', '.join(report['tomorrow']) or '-'}")
+    console.print(Columns([
+        draw_counts("📅 By month", report['months']),
+        draw_counts("🗓 Born on", report['weekdays']),
+        draw_counts("🎈 By age", report['ages']),
+    ]))
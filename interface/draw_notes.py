@@ -3,11 +3,11 @@ from rich.table import Table
 
 from notes import Note
 
-def draw_notes(console: Console, notes: list[Note]) -> None:
+def draw_notes(console: Console, notes: list[Note], caption: str | None = None) -> None:
     """
     Displays a list of notes in a table view using rows in console
     """
-    table = Table(title="📂 All Notes")
+    table = Table(title="📂 All Notes", caption=caption)
 
     table.add_column("📝 Title", style="bold cyan", no_wrap=True)
     table.add_column("🗒 Content", style="white")
@@ -4,11 +4,11 @@ from rich.table import Table
 from addressbook import Record
 
 
-def draw_records(console: Console, records: list[Record], title:str):
+def draw_records(console: Console, records: list[Record], title:str, caption: str | None = None):
     """
     Displays a list of contacts in a table view using rows in console
     """
-    table = Table(title=title)
+    table = Table(title=title, caption=caption)
     table.add_column("Name", justify="left", style="cyan", no_wrap=True)
     table.add_column("Phones", style="magenta")
     table.add_column("Birthday", justify="left", style="green")
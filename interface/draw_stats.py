@@ -0,0 +1,21 @@
+from rich.console import Console
+from rich.table import Table
+
+def draw_stats(console: Console, report: dict[str, dict]) -> None:
+    """
+    Displays latencies of operations measured in this session in console
+    """
+    table = Table(title="⏱ Session stats", caption="commands include the time spent at their prompts")
+    table.add_column("Operation", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("p50 ms", justify="right", style="green")
+    table.add_column("p95 ms", justify="right", style="yellow")
+    table.add_column("p99 ms", justify="right", style="magenta")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Blocks/call", justify="right")
+    for name, metric in report.items():
+        table.add_row(name, str(metric["count"]), f"{metric['p50_ms']:.3f}", f"{metric['p95_ms']:.3f}",
+                      f"{metric['p99_ms']:.3f}", f"{metric['max_ms']:.3f}", f"{metric['total_ms']:.1f}",
+                      f"{metric['alloc_blocks']:g}")
+    console.print(table)
@@ -0,0 +1,96 @@
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from typing import TextIO
+
+from addressbook import Record
+from bulk_export import (CONTACT_COLUMNS, NOTE_COLUMNS, contact_row, note_row,
+                         write_jsonl, write_tsv)
+from notes import Note
+
+from .app_interface import AppInterface
+
+# rows fetched and written at once when streaming a paged listing
+CHUNK_SIZE = 1000
+
+OUTPUT_FORMATS = ['rich', 'tsv', 'jsonl']
+
+def chunks(total: int, fetch: Callable[[int, int], list]) -> Iterator:
+    for start in range(0, total, CHUNK_SIZE):
+        yield from fetch(start, CHUNK_SIZE)
+
+class MachineInterface(AppInterface):
+    """
+    Output for scripts and pipes: listings are written to stdout as TSV or
+    JSONL rows without building any rich renderables, messages go to stderr
+    """
+
+    def __init__(self, output_format: str = 'tsv', out: TextIO = None, err: TextIO = None):
+        self.console = None
+        self.output_format = output_format
+        self.out = out if out else sys.stdout
+        self.err = err if err else sys.stderr
+
+    def write_rows(self, rows: Iterable[dict], columns: list[str]) -> None:
+        if self.output_format == 'jsonl':
+            write_jsonl(self.out, rows, columns)
+        else:
+            write_tsv(self.out, rows, columns)
+        self.out.flush()
+
+    def draw_header(self, commands: list[str]):
+        pass
+
+    def draw_note(self, note: Note) -> None:
+        self.write_rows([note_row(note)], NOTE_COLUMNS)
+
+    def draw_notes(self, notes: list[Note]) -> None:
+        self.write_rows(map(note_row, notes), NOTE_COLUMNS)
+
+    def draw_notes_paged(self, total: int, fetch: Callable[[int, int], list[Note]]) -> None:
+        self.write_rows(map(note_row, chunks(total, fetch)), NOTE_COLUMNS)
+
+    def draw_record(self, record: Record) -> None:
+        self.write_rows([contact_row(record)], CONTACT_COLUMNS)
+
+    def draw_records(self, records: list[Record], title="Found contacts") -> None:
+        self.write_rows(map(contact_row, records), CONTACT_COLUMNS)
+
+    def draw_records_paged(self, total: int, fetch: Callable[[int, int], list[Record]],
+                           title="Found contacts") -> None:
+        self.write_rows(map(contact_row, chunks(total, fetch)), CONTACT_COLUMNS)
+
+    def draw_analytics(self, report: dict) -> None:
+        if self.output_format == 'jsonl':
+            self.out.write(json.dumps(report, ensure_ascii=False) + "\n")
+        else:
+            rows = [{"section": "total", "label": "", "value": report["total"]}]
+            rows += [{"section": section, "label": label, "value": value}
+                    for section in ("months", "weekdays", "ages")
+                    for label, value in report[section].items()]
+            rows += [{"section": section, "label": "", "value": name}
+                     for section in ("today", "tomorrow")
+                     for name in report[section]]
+            write_tsv(self.out, rows, ["section", "label", "value"])
+        self.out.flush()
+
+    def draw_birthdays(self, birthdays: list[dict]) -> None:
+        rows = [{**person, "birthday": person["birthday"].strftime("%d.%m.%Y")} for person in birthdays]
+        self.write_rows(rows, ["name", "birthday", "congratulation_date"])
+
+    def draw_stats(self, report: dict[str, dict]) -> None:
+        rows = [{"operation": name, **metric} for name, metric in report.items()]
+        self.write_rows(rows, ["operation", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "total_ms",
+                               "alloc_blocks"])
+
+    def draw_info(self, message: str):
+        print(message, file=self.err)
+
+    def draw_failure(self, message: str):
+        print(f"error: {message}", file=self.err)
+
+    def draw_warning(self, message: str):
+        print(f"warning: {message}", file=self.err)
+
+    def draw_success(self, message: str):
+        print(message, file=self.err)
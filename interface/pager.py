@@ -0,0 +1,36 @@
+from collections.abc import Callable
+
+from .prompt_page import prompt_page
+from .prompt_script import prompt_script
+
+def page_through(total: int,
+                 page_size: int,
+                 fetch: Callable[[int, int], list],
+                 draw: Callable[[list, str | None], None]) -> None:
+    """
+    Shows items page by page: only the rows of the current page are
+    fetched and rendered, the user moves between pages with the keyboard.
+    Batch scripts get all items at once.
+    """
+    pages = max(1, (total + page_size - 1) // page_size)
+
+    if pages == 1 or prompt_script.active:
+        draw(fetch(0, total), None)
+        return
+
+    page = 0
+    while True:
+        draw(fetch(page * page_size, page_size),
+             f"{page * page_size + 1}-{min(total, (page + 1) * page_size)} of {total}")
+
+        match prompt_page(page + 1, pages):
+            case "next":
+                page = min(page + 1, pages - 1)
+            case "previous":
+                page = max(page - 1, 0)
+            case "first":
+                page = 0
+            case "last":
+                page = pages - 1
+            case _:
+                return
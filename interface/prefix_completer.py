@@ -0,0 +1,18 @@
+from collections.abc import Callable
+
+from prompt_toolkit.completion import Completer, Completion
+
+class PrefixCompleter(Completer):
+    """
+    Completes the whole input with words returned by a prefix index,
+    asking it only for the few completions the menu can show
+    """
+
+    def __init__(self, complete: Callable[[str, int], list[str]], limit: int = 10):
+        self.complete = complete
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor.lstrip()
+        for word in self.complete(text, self.limit):
+            yield Completion(word, start_position=-len(text))
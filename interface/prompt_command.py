@@ -1,42 +1,54 @@
-from prompt_toolkit.completion import WordCompleter
+from indexes import PrefixIndex
 
+from .prefix_completer import PrefixCompleter
 from .prompt_helper import prompt_helper
 
-class CommandCompleter(WordCompleter):
-    def get_completions(self, document, complete_event):
-        text = document.text_before_cursor.strip().lower()
-        if " " in text:
-            return
-        yield from super().get_completions(document, complete_event)
-
-commands_completer = CommandCompleter([name for name in {
+commands_index = PrefixIndex()
+for command in {
     'add contact',
     'delete contact',
     'edit contact',
     'list contacts',
     'search contacts',
     'show contact',
+    'import contacts',
+    'export contacts',
 
     'add note',
     'edit note',
     'delete note',
     'list notes',
     'search notes',
+    'search text',
     'show notes',
+    'export notes',
 
     'show birthdays',
-}])
+    'show analytics',
+
+    'show stats',
+}:
+    commands_index.add(command)
+
+commands_completer = PrefixCompleter(commands_index.complete, limit=len(commands_index))
 
 bottom_toolbar_default = [("class:bottom-toolbar",
                            " 🧠 Tab — autocomplete | Ctrl+C or exit/quit — exit")]
 
-commands_session = prompt_helper(message=[("class:prompt", ">>> ")],
-                                 completer=commands_completer,
-                                 complete_while_typing=True,
-                                 bottom_toolbar=bottom_toolbar_default)
+# created on first use, so batch runs never touch the terminal
+commands_session = None
+
+def get_commands_session():
+    global commands_session
+    if commands_session is None:
+        commands_session = prompt_helper(message=[("class:prompt", ">>> ")],
+                                         completer=commands_completer,
+                                         complete_while_typing=True,
+                                         bottom_toolbar=bottom_toolbar_default)
+    return commands_session
 
 def prompt_command():
     """
     Prompts user to input a text command and returns the response
     """
-    return commands_session.prompt()
+    return get_commands_session().prompt()
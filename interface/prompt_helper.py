@@ -1,6 +1,9 @@
+import sys
+
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer
 from prompt_toolkit.formatted_text import AnyFormattedText
+from prompt_toolkit.output import Output, create_output
 from prompt_toolkit.styles import Style
 from prompt_toolkit.validation import Validator
 
@@ -16,6 +19,12 @@ style = Style.from_dict(
     }
 )
 
+def prompt_output() -> Output | None:
+    """
+    Prompts go to stderr when stdout is piped, so they do not mix with the output
+    """
+    return None if sys.stdout.isatty() else create_output(stdout=sys.stderr)
+
 def prompt_helper(message: AnyFormattedText = None,
                   *,
                   complete_while_typing: bool = True,
@@ -33,4 +42,5 @@ def prompt_helper(message: AnyFormattedText = None,
                          search_ignore_case=search_ignore_case,
                          validator=validator,
                          completer=completer,
-                         bottom_toolbar=bottom_toolbar)
+                         bottom_toolbar=bottom_toolbar,
+                         output=prompt_output())
@@ -0,0 +1,28 @@
+from prompt_toolkit.key_binding import KeyBindings
+
+from .prompt_helper import prompt_helper
+
+PAGE_KEYS = {
+    "next": ["right", "down", "pagedown", "space", "n"],
+    "previous": ["left", "up", "pageup", "p"],
+    "first": ["home", "g"],
+    "last": ["end", "G"],
+    "quit": ["escape", "q", "enter", "c-c"],
+}
+
+bindings = KeyBindings()
+
+for action, keys in PAGE_KEYS.items():
+    for key in keys:
+        bindings.add(key, eager=True)(lambda event, action=action: event.app.exit(result=action))
+
+def prompt_page(page: int, pages: int) -> str:
+    """
+    Waits for a single navigation key and returns one of
+    'next', 'previous', 'first', 'last' or 'quit'
+    """
+    session = prompt_helper(message=[("class:prompt",
+                                      f"Page {page}/{pages}  ←/→ previous/next, Home/End first/last, q quit")],
+                            complete_while_typing=False,
+                            validate_while_typing=False)
+    return session.prompt(key_bindings=bindings)
@@ -0,0 +1,40 @@
+from collections import deque
+from collections.abc import Iterable
+
+class ScriptError(Exception):
+    pass
+
+class PromptScript:
+    """
+    Answers prompts from a batch script instead of the terminal.
+
+    While a command of the script runs its remaining arguments are the
+    answers, consumed by prompts in the order they are asked.
+    """
+
+    def __init__(self):
+        self.answers: deque[str] | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.answers is not None
+
+    def start(self, answers: Iterable[str]) -> None:
+        self.answers = deque(answers)
+
+    def finish(self) -> list[str]:
+        """
+        Stops answering prompts and returns the answers no prompt asked for
+        """
+        unused = list(self.answers or ())
+        self.answers = None
+        return unused
+
+    def answer(self, label: str, optional: bool = False) -> str:
+        if self.answers:
+            return self.answers.popleft()
+        if optional:
+            return ""
+        raise ScriptError(f"No answer for '{label.strip().rstrip(':')}'")
+
+prompt_script = PromptScript()
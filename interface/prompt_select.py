@@ -1,14 +1,27 @@
-from prompt_toolkit.completion import WordCompleter
 from prompt_toolkit.validation import Validator
 
+from indexes import PrefixIndex
+
+from .prefix_completer import PrefixCompleter
 from .prompt_helper import prompt_helper
+from .prompt_script import ScriptError, prompt_script
 
 def prompt_select(message: str, options: list[str]):
     """
     Prompts user to input a preferred option for prepared list and returns the response
     """
+    if prompt_script.active:
+        answer = prompt_script.answer(message)
+        if answer not in options:
+            raise ScriptError(f"'{answer}' is not one of {'/'.join(options)}")
+        return answer
+
+    index = PrefixIndex()
+    for option in options:
+        index.add(option)
+
     session = prompt_helper(message=f"🔹 {message} ({"/".join(options)})? ",
-                            completer=WordCompleter(options),
+                            completer=PrefixCompleter(index.complete, limit=len(options)),
                             complete_while_typing=True,
                             validator=Validator.from_callable(lambda i: i in options),
                             validate_while_typing=True)
@@ -1,8 +1,14 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, ValuesView
 from datetime import datetime
+import os
 import pickle
+import sys
+
+from indexes import FullTextIndex, PrefixIndex, TagIndex
 
 class Note:
+    _manager: Optional["NotesManager"] = None
+
     def __init__(self, title: str, content: str, tags: Optional[List[str]] = None):
         self.title = title
         self.content = content
@@ -13,16 +19,28 @@ class Note:
     def update_content(self, new_content: str):
         self.content = new_content
         self.updated_at = datetime.now()
+        self._changed()
 
     def add_tag(self, tag: str):
         if tag not in self.tags:
             self.tags.append(tag)
             self.updated_at = datetime.now()
+            self._changed()
 
     def remove_tag(self, tag: str):
         if tag in self.tags:
             self.tags.remove(tag)
             self.updated_at = datetime.now()
+            self._changed()
+
+    def _changed(self):
+        if self._manager is not None:
+            self._manager._note_changed(self, self.title)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_manager", None)
+        return state
 
 def __str__(self) -> str:
     if not self.notes:
@@ -36,67 +54,211 @@ def __str__(self) -> str:
 
     return "\n\n".join(str(note) for note in sorted_notes)
 
+ChangeObserver = Callable[[str, str, object], None]
+
+class NoteExistsError(Exception):
+    pass
+
+class TitleFormatError(Exception):
+    pass
+
+def validate_title(title: str) -> None:
+    if not title.strip():
+        raise TitleFormatError("Title cannot be blank")
+
+def note_key(title: str) -> str:
+    return title.lower()
+
+def note_words(key: str, note: Note) -> list[str]:
+    return [note.title, *note.tags]
+
 class NotesManager:
+    """
+    Stores notes by case-folded title and reports every change ("put" or
+    "delete" of a note under the key of the title it had before the change)
+    to the subscribed observers.
+
+    Indexes are built on first use and then kept up to date as observers.
+    `changes` counts the changes, the notes are `dirty` until they are saved.
+    """
     def __init__(self):
-        self.notes = []
+        self._notes: Dict[str, Note] = {}
+        self._observers: List[ChangeObserver] = []
+        self._indexes: Dict[str, object] = {}
+        self.changes = 0
+        self.saved_changes = 0
+
+    @property
+    def notes(self) -> ValuesView[Note]:
+        """
+        Live view of the notes, use `get_all_notes` for a list to keep
+        """
+        return self._notes.values()
+
+    def subscribe(self, observer: ChangeObserver) -> None:
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer: ChangeObserver) -> None:
+        self._observers.remove(observer)
+
+    def apply_change(self, op: str, key: str, note: Optional[Note]) -> None:
+        """
+        Applies a change reported by an observer, e.g. when replaying a journal
+        """
+        match op:
+            case "put":
+                current = self._notes.pop(key, None)
+                if current is not None and current is not note:
+                    current._manager = None
+                note._manager = self
+                self._notes[note_key(note.title)] = note
+            case "delete":
+                current = self._notes.pop(key, None)
+                if current is not None:
+                    current._manager = None
+            case _:
+                raise ValueError(f"Unknown change operation {op}")
+        self._notify(op, key, note)
 
-    def add_note(self, title: str, content: str, tags: Optional[List[str]] = None):
+    def _note_changed(self, note: Note, old_title: str) -> None:
+        self._notify("put", note_key(old_title), note)
+
+    @property
+    def dirty(self) -> bool:
+        return self.changes != self.saved_changes
+
+    def mark_saved(self, changes: int) -> None:
+        """
+        Records that the state after the given number of changes was saved
+        """
+        self.saved_changes = changes
+
+    def _notify(self, op: str, key: str, note: Optional[Note]) -> None:
+        self.changes += 1
+        for observer in self._observers:
+            observer(op, key, note)
+
+    def _get_index(self, name: str, factory: Callable[[], object]):
+        index = self._indexes.get(name)
+        if index is None:
+            index = factory()
+            for key, note in self._notes.items():
+                index.update("put", key, note)
+            self.subscribe(index.update)
+            self._indexes[name] = index
+        return index
+
+    def add_note(self, title: str, content: str, tags: Optional[List[str]] = None) -> Note:
+        validate_title(title)
         if self.find_note_by_title(title):
-            print("[!] Note with this title already exists.")
-            return None
+            raise NoteExistsError(f"Note {title} already exists")
         note = Note(title, content, tags)
 
-        self.notes.append(note)
-
-        print("\n✅ Note added.")
+        note._manager = self
+        self._notes[note_key(title)] = note
+        self._notify("put", note_key(title), note)
 
         return note
 
     def get_all_notes(self) -> List[Note]:
-        return self.notes
+        return list(self._notes.values())
 
     def search_notes_by_title(self, term: str) -> List[Note]:
-        return [note for note in self.notes if term.lower() in note.title.lower()]
+        return [note for key, note in self._notes.items() if term.lower() in key]
 
     def search_notes_by_tags(self, term: str) -> List[Note]:
-        return [note for note in self.notes if any(term.lower() in tag.lower() for tag in note.tags)]
+        notes = self._get_index("tags", lambda: TagIndex(note_key)).search(term)
+        return sorted(notes, key=lambda note: note.created_at)
+
+    def search_notes(self, query: str, limit: int = 10) -> List[Note]:
+        """
+        Ranked search over titles, tags and content of notes.
+        Supports "quoted phrases" and prefix* words.
+        """
+        return self._get_index("text", lambda: FullTextIndex(note_key)).search(query, limit)
 
     def find_note_by_title(self, title: str) -> Optional[Note]:
-        for note in self.notes:
-            if note.title.lower() == title.lower():
-                return note
-        return None
+        return self._notes.get(note_key(title))
 
-    def find_and_remove_note(self, title: str):
+    def find_and_remove_note(self, title: str) -> bool:
         note = self.find_note_by_title(title)
         if note:
-            self.notes.remove(note)
-            print(f"\n✅ Note '{note.title}' removed.")
-        else:
-            print("[!] Note not found.")
-
-    def remove_note(self, note: Note):
-        if note in self.notes:
-            self.notes.remove(note)
-            print(f"\n✅ Note '{note.title}' removed.")
-        else:
-            print("[!] Note not found.")
-
-    def edit_note(self, note: Note, new_title: str, new_content: str, new_tags: List[str]):
+            self.__detach(note)
+            return True
+        return False
+
+    def remove_note(self, note: Note) -> bool:
+        if self._notes.get(note_key(note.title)) is note:
+            self.__detach(note)
+            return True
+        return False
+
+    def __detach(self, note: Note):
+        del self._notes[note_key(note.title)]
+        note._manager = None
+        self._notify("delete", note_key(note.title), None)
+
+    def edit_note(self, note: Note, new_title: str, new_content: str, new_tags: List[str]) -> Note:
+        old_title = note.title
+        validate_title(new_title)
+        if note_key(new_title) != note_key(old_title) and self.find_note_by_title(new_title):
+            raise NoteExistsError(f"Note {new_title} already exists")
         note.title = new_title
         note.content = new_content
         note.tags = new_tags
         note.updated_at = datetime.now()
-        print(f"\n✅ Note '{note.title}' updated.")
+        if note_key(new_title) != note_key(old_title):
+            del self._notes[note_key(old_title)]
+            self._notes[note_key(new_title)] = note
+        self._note_changed(note, old_title)
+        return note
+
+    def __words(self) -> PrefixIndex:
+        return self._get_index("words", lambda: PrefixIndex(note_words, key=lambda note: note_key(note.title)))
+
+    def complete_words(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Titles and tags starting with the prefix
+        """
+        return self.__words().complete(prefix, limit)
 
     def get_autocomplete_words(self) -> List[str]:
-        titles = [note.title for note in self.notes]
-        tags = [tag for note in self.notes for tag in note.tags]
-        return titles + tags
+        return list(self.__words())
+
+    def __getstate__(self):
+        return {"notes": list(self._notes.values())}
+
+    def __setstate__(self, state):
+        self._notes = {}
+        self._observers = []
+        self._indexes = {}
+        self.changes = 0
+        self.saved_changes = 0
+        for note in state["notes"]:
+            key = note_key(note.title)
+            if key in self._notes:
+                # older versions allowed renaming a note to an existing title
+                suffix = 2
+                while note_key(f"{note.title} ({suffix})") in self._notes:
+                    suffix += 1
+                note.title = f"{note.title} ({suffix})"
+                key = note_key(note.title)
+            note._manager = self
+            self._notes[key] = note
 
     def save(self, filename="notes.pkl") -> None:
-        with open(filename, "wb") as f:
+        """
+        Writes the notes to a temporary file first and replaces the file
+        with it, so a crash while saving never leaves truncated notes behind
+        """
+        changes = self.changes
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
             pickle.dump(self, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+        self.mark_saved(changes)
 
     @staticmethod
     def load(filename: str = "notes.pkl") -> "NotesManager":
@@ -104,11 +266,11 @@ class NotesManager:
             with open(filename, "rb") as f:
                 return pickle.load(f)
         except (FileNotFoundError, EOFError, pickle.UnpicklingError):
-            print("⚠️ Notes Book not found, created new.")
+            print("⚠️ Notes Book not found, created new.", file=sys.stderr)
             return NotesManager()
 
     def __str__(self) -> str:
         return "\n".join(
             f"{note.title} | {note.content} | {', '.join(note.tags)} | Created: {note.created_at.strftime('%Y-%m-%d %H:%M')} | Updated: {note.updated_at.strftime('%Y-%m-%d %H:%M')}"
-            for note in self.notes
+            for note in self._notes.values()
         )
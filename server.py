@@ -0,0 +1,496 @@
+import asyncio
+import json
+import signal
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from datetime import date
+from itertools import islice
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from addressbook import (DateFormatError, EmailExistsError, EmailFormatError,
+                         NameFormatError, PhoneExistsError, PhoneFormatError)
+from app_state import AppState
+from bulk_export import contact_row, note_row, select_contacts, select_notes
+from bulk_import import build_record, validate_row
+from instrumentation import stats
+from notes import Note, NoteExistsError, TitleFormatError
+from storage import CODECS, STORAGES
+
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+DEFAULT_LIMIT = 100
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+class ReadWriteLock:
+    """
+    Lets any number of readers in at once, or a single writer. Waiting
+    writers go first, so a steady stream of reads cannot starve them.
+    """
+
+    def __init__(self):
+        self.condition = asyncio.Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: not self.writing and not self.waiting_writers)
+            self.readers += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self.condition:
+            self.waiting_writers += 1
+            try:
+                await self.condition.wait_for(lambda: not self.writing and not self.readers)
+            finally:
+                self.waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+def query_int(query: dict, name: str, default: int) -> int:
+    try:
+        return int(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be a number")
+
+
+def query_days(query: dict, default: int | None) -> int | None:
+    """
+    Days ahead to look for birthdays, longer windows would wrap over the
+    same dates again
+    """
+    if "days" not in query:
+        return default
+    days = query_int(query, "days", 0)
+    if not 1 <= days <= 365:
+        raise HTTPError(400, "days must be between 1 and 365")
+    return days
+
+
+def page_bounds(query: dict) -> tuple[int, int]:
+    offset = query_int(query, "offset", 0)
+    limit = query_int(query, "limit", DEFAULT_LIMIT)
+    if offset < 0 or limit < 0:
+        raise HTTPError(400, "offset and limit cannot be negative")
+    return offset, limit
+
+
+def page(rows, query: dict) -> list:
+    offset, limit = page_bounds(query)
+    return list(islice(rows, offset, offset + limit))
+
+
+def contact_fields(body: dict) -> dict:
+    """
+    Fields of a contact in the shape `validate_row` takes, phones and
+    emails may be given as a list or a single value
+    """
+    fields = {"phones": [], "emails": []}
+    for key in ("name", "phones", "emails", "birthday", "address"):
+        value = body.get(key)
+        if value is None:
+            continue
+        if key in ("phones", "emails"):
+            fields[key] = [str(item) for item in value] if isinstance(value, list) else [str(value)]
+        else:
+            fields[key] = str(value)
+    return fields
+
+
+def validated_record(fields: dict):
+    _, valid, error = validate_row((0, fields))
+    if valid is None:
+        raise HTTPError(400, error)
+    return build_record(valid)
+
+
+def find_contact(state: AppState, name: str):
+    record = state.book.find(name)
+    if record is None:
+        similar = [record.name.value for record in state.book.find_similar(name)]
+        raise HTTPError(404, f"Contact {name} not found", similar=similar)
+    return record
+
+
+def find_note(state: AppState, title: str) -> Note:
+    note = state.notes.find_note_by_title(title)
+    if note is None:
+        raise HTTPError(404, f"Note {title} not found")
+    return note
+
+
+def note_fields(body: dict, note: Note | None = None) -> tuple[str, str, list[str]]:
+    title = str(body.get("title", note.title if note else "")).strip()
+    content = str(body.get("content", note.content if note else ""))
+    tags = body.get("tags", note.tags if note else [])
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return title, content, [str(tag).strip() for tag in tags if str(tag).strip()]
+
+
+def list_contacts(state: AppState, query: dict, body: dict):
+    days = query_days(query, None)
+    records = select_contacts(state.book, term=query.get("q", ""), days=days)
+    return 200, {"contacts": [contact_row(record) for record in page(records, query)]}
+
+
+def show_contact(state: AppState, query: dict, body: dict, name: str):
+    return 200, contact_row(find_contact(state, name))
+
+
+def add_contact(state: AppState, query: dict, body: dict):
+    record = validated_record(contact_fields(body))
+    if record.name.value in state.book:
+        raise HTTPError(409, f"Contact {record.name.value} already exists")
+    state.book.add_record(record)
+    return 201, contact_row(record)
+
+
+def edit_contact(state: AppState, query: dict, body: dict, name: str):
+    current = find_contact(state, name)
+    record = validated_record(contact_fields({**contact_row(current), **body}))
+    key = current.name.value
+    if record.name.value == key:
+        state.book[key] = record
+        return 200, contact_row(record)
+
+    if record.name.value in state.book:
+        raise HTTPError(409, f"Contact {record.name.value} already exists")
+    # renamed, phones and emails of the old record must not count as taken
+    del state.book[key]
+    try:
+        state.book.add_record(record)
+    except (PhoneExistsError, EmailExistsError):
+        state.book.add_record(current)
+        raise
+    return 200, contact_row(record)
+
+
+def delete_contact(state: AppState, query: dict, body: dict, name: str):
+    record = find_contact(state, name)
+    state.book.delete(record.name.value)
+    return 200, {"deleted": record.name.value}
+
+
+def show_birthdays(state: AppState, query: dict, body: dict):
+    days = query_days(query, 7)
+    return 200, {"birthdays": [
+        {**person, "birthday": person["birthday"].strftime("%d.%m.%Y")}
+        for person in state.book.get_upcoming_birthday(limit=days)
+    ]}
+
+
+def show_analytics(state: AppState, query: dict, body: dict):
+    from birthday_analytics import BirthdayColumns
+
+    return 200, BirthdayColumns.from_book(state.book).report(date.today())
+
+
+def list_notes(state: AppState, query: dict, body: dict):
+    if query.get("q"):
+        offset, limit = page_bounds(query)
+        notes = page(state.notes.search_notes(query["q"], offset + limit), query)
+    else:
+        notes = page(select_notes(state.notes, tag=query.get("tag", "")), query)
+    return 200, {"notes": [note_row(note) for note in notes]}
+
+
+def show_note(state: AppState, query: dict, body: dict, title: str):
+    return 200, note_row(find_note(state, title))
+
+
+def add_note(state: AppState, query: dict, body: dict):
+    note = state.notes.add_note(*note_fields(body))
+    return 201, note_row(note)
+
+
+def edit_note(state: AppState, query: dict, body: dict, title: str):
+    note = find_note(state, title)
+    state.notes.edit_note(note, *note_fields(body, note))
+    return 200, note_row(note)
+
+
+def delete_note(state: AppState, query: dict, body: dict, title: str):
+    note = find_note(state, title)
+    state.notes.remove_note(note)
+    return 200, {"deleted": note.title}
+
+
+def show_stats(state: AppState, query: dict, body: dict):
+    return 200, stats.report()
+
+
+# (method, path with None for a parameter, handler, changes the state)
+ROUTES: list[tuple[str, tuple, Callable, bool]] = [
+    ("GET", ("contacts",), list_contacts, False),
+    ("POST", ("contacts",), add_contact, True),
+    ("GET", ("contacts", None), show_contact, False),
+    ("PUT", ("contacts", None), edit_contact, True),
+    ("DELETE", ("contacts", None), delete_contact, True),
+    ("GET", ("birthdays",), show_birthdays, False),
+    ("GET", ("analytics",), show_analytics, False),
+    ("GET", ("notes",), list_notes, False),
+    ("POST", ("notes",), add_note, True),
+    ("GET", ("notes", None), show_note, False),
+    ("PUT", ("notes", None), edit_note, True),
+    ("DELETE", ("notes", None), delete_note, True),
+    ("GET", ("stats",), show_stats, False),
+]
+
+
+def route(method: str, parts: list[str]) -> tuple[Callable, list[str], bool, str]:
+    allowed = False
+    for route_method, pattern, handler, writes in ROUTES:
+        if len(pattern) != len(parts) or any(p is not None and p != part for p, part in zip(pattern, parts)):
+            continue
+        if route_method != method:
+            allowed = True
+            continue
+        params = [part for p, part in zip(pattern, parts) if p is None]
+        name = "/".join(p or "{}" for p in pattern)
+        return handler, params, writes, name
+    if allowed:
+        raise HTTPError(405, f"Method {method} not allowed")
+    raise HTTPError(404, "Not found")
+
+
+def error_response(e: Exception) -> tuple[int, dict]:
+    match e:
+        case HTTPError():
+            return e.status, {"error": str(e), **e.details}
+        case PhoneExistsError() | EmailExistsError() | NoteExistsError():
+            return 409, {"error": str(e)}
+        case NameFormatError():
+            return 400, {"error": "Name cannot be blank"}
+        case TitleFormatError():
+            return 400, {"error": str(e)}
+        case PhoneFormatError():
+            return 400, {"error": "Wrong phone format."}
+        case EmailFormatError():
+            return 400, {"error": "Wrong email format."}
+        case DateFormatError():
+            return 400, {"error": "Invalid date format. Use DD.MM.YYYY"}
+        case _:
+            print(f"⚠️ {type(e).__name__}: {e}", file=sys.stderr)
+            return 500, {"error": "Internal error"}
+
+
+class AppServer:
+    """
+    JSON over HTTP access to the address book and notes of one shared state.
+
+    Reads run right on the event loop and may go on together. Writes wait
+    for running reads, then run one at a time in a worker thread holding
+    `AppState.lock`, so waiting for a background save never blocks the loop.
+    Autosaves go through the same write lock, as saving may reopen the files
+    reads are served from (mmap, blocks) or use their sqlite connection.
+    """
+
+    def __init__(self, state: AppState, *, autosave: float = 0, autosave_every: int = 50):
+        self.state = state
+        self.lock = ReadWriteLock()
+        self.autosave = autosave
+        self.autosave_every = autosave_every
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def save(self) -> None:
+        """
+        Saves once running reads are done, keeping new ones out until it is
+        """
+        async with self.lock.write():
+            await asyncio.to_thread(self.state.save)
+
+    def save_from_thread(self) -> None:
+        """
+        `save` for the autosaver thread, waits for it to run on the loop
+        """
+        asyncio.run_coroutine_threadsafe(self.save(), self.loop).result()
+
+    def locked(self, handler: Callable, *args):
+        with self.state.lock:
+            return handler(self.state, *args)
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, object]:
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = dict(parse_qsl(url.query))
+        try:
+            handler, params, writes, name = route(method, parts)
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                raise HTTPError(400, "Body must be JSON")
+            if not isinstance(data, dict):
+                raise HTTPError(400, "Body must be a JSON object")
+
+            with stats.measure(f"http.{method} /{name}"):
+                if writes:
+                    async with self.lock.write():
+                        return await asyncio.to_thread(self.locked, handler, query, data, *params)
+                async with self.lock.read():
+                    return handler(self.state, query, data, *params)
+        except Exception as e:
+            return error_response(e)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves requests of one connection, HTTP/1.1 connections are kept open
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    if len(headers) >= MAX_HEADERS:
+                        raise ConnectionError("too many headers")
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    await self.respond(writer, 413 if length > MAX_BODY else 400,
+                                       {"error": "Bad body length"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method.upper(), target, body)
+                await self.respond(writer, status, payload, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: int, payload, *, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Serves until SIGINT or SIGTERM
+        """
+        stop = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.loop.add_signal_handler(signum, stop.set)
+
+        autosaver = None
+        if self.autosave > 0:
+            from autosave import Autosaver
+            autosaver = Autosaver(self.state, delay=self.autosave, every=self.autosave_every,
+                                  save=self.save_from_thread)
+            autosaver.start()
+
+        server = await asyncio.start_server(self.handle, host, port)
+        addresses = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+        print(f"Serving on {addresses}", file=sys.stderr)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if autosaver is not None:
+                # in a thread, so a save it is waiting for can still run on the loop
+                await asyncio.to_thread(autosaver.stop)
+
+
+def parse_args():
+    parser = ArgumentParser(description="JSON over HTTP service for the address book and notes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--storage", choices=STORAGES.keys(), default="pickle",
+                        help="how the address book and notes are persisted")
+    parser.add_argument("--unique-keys", action="store_true",
+                        help="do not allow the same phone or email on several contacts")
+    parser.add_argument("--codec", choices=CODECS.keys(),
+                        help="compression of block storage files (default: zlib)")
+    parser.add_argument("--autosave", metavar="SECONDS", type=float, default=2.0,
+                        help="save in background this long after the last change, 0 saves on exit only")
+    parser.add_argument("--autosave-every", metavar="N", type=int, default=50,
+                        help="save in background right away once N changes are unsaved")
+    parser.add_argument("--stats-file", metavar="FILE",
+                        help="write latencies of requests to a JSON file on exit")
+    args = parser.parse_args()
+    if args.codec and args.storage != "blocks":
+        parser.error("--codec only applies to --storage blocks")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    with stats.measure("state.load"):
+        state = AppState.load(storage=args.storage, unique_keys=args.unique_keys, codec=args.codec)
+
+    try:
+        asyncio.run(AppServer(state, autosave=args.autosave, autosave_every=args.autosave_every)
+                    .serve(args.host, args.port))
+    finally:
+        state.save()
+        state.close()
+        if args.stats_file:
+            stats.dump(args.stats_file)
+        print("Address book saved. Bye!", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
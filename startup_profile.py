@@ -0,0 +1,44 @@
+import sys
+import time
+from collections.abc import Callable
+from typing import TextIO, TypeVar
+
+T = TypeVar("T")
+
+class StartupProfile:
+    """
+    Wall time of the startup stages with the packages each stage imported,
+    and of the work done in the background meanwhile
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.modules = set(sys.modules)
+        self.stages: list[tuple[str, float, list[str]]] = []
+        self.background: list[tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        """
+        Ends the stage that started at the previous mark
+        """
+        now = time.perf_counter()
+        modules = set(sys.modules)
+        packages = sorted({name.split(".")[0] for name in modules - self.modules if not name.startswith("_")})
+        self.stages.append((stage, now - self.last, packages))
+        self.last = now
+        self.modules = modules
+
+    def timed(self, stage: str, fn: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.background.append((stage, time.perf_counter() - started))
+
+    def report(self, out: TextIO = sys.stderr) -> None:
+        for stage, seconds, packages in self.stages:
+            print(f"{stage:<12}{seconds * 1000:8.1f} ms  {', '.join(packages)}", file=out)
+        for stage, seconds in self.background:
+            print(f"{stage:<12}{seconds * 1000:8.1f} ms  (in background)", file=out)
+        print(f"{'total':<12}{(self.last - self.started) * 1000:8.1f} ms", file=out)
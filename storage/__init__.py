@@ -0,0 +1,17 @@
+from .block_book import CODECS, BlockAddressBook, BlockStorage
+from .journal_storage import JournalStorage
+from .mmap_book import MmapAddressBook, MmapStorage
+from .pickle_storage import PickleStorage
+from .shared_storage import SharedStorage
+from .sharded_book import ShardedAddressBook, ShardedStorage
+from .sqlite_book import SqliteAddressBook, SqliteStorage
+
+STORAGES = {
+    'pickle': PickleStorage,
+    'journal': JournalStorage,
+    'sqlite': SqliteStorage,
+    'mmap': MmapStorage,
+    'shared': SharedStorage,
+    'sharded': ShardedStorage,
+    'blocks': BlockStorage,
+}
@@ -0,0 +1,313 @@
+import bisect
+import lzma
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import sys
+import zlib
+from collections.abc import Iterable, Iterator
+
+from addressbook import AddressBook
+from notes import NotesManager, note_key
+
+from .mmap_book import MmapAddressBook, MmapRecords, MmapStorage
+
+MAGIC = b"ABBLK\x00\x00\x01"
+# magic, codec, number of records, offset of the index, length of the index, crc32 of the index
+HEADER = struct.Struct("<8sBQQII")
+# length of the compressed block, number of records in it, crc32 of the compressed block
+BLOCK = struct.Struct("<III")
+# offset of the block, number of records in it, length of the name of its first record
+ENTRY = struct.Struct("<QIH")
+# uncompressed size a block is filled up to
+BLOCK_SIZE = 64 * 1024
+
+CODECS = {
+    "zlib": (0, lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (1, lzma.compress, lzma.decompress),
+}
+CODEC_NAMES = {number: name for name, (number, _, _) in CODECS.items()}
+
+
+class BlockFile:
+    """
+    Read-only view of a block file mapped into memory.
+
+    Records are kept as (name, pickle) pairs sorted by name and grouped into
+    blocks compressed on their own, each with a crc32. An index of the first
+    name of every block at the end of the file finds the one block holding a
+    record. Blocks failing their check are reported and skipped, the rest of
+    the file stays readable; when the index itself is damaged (e.g. the file
+    was truncated) the blocks are found by walking the file from the start.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self.lost = 0
+        self.codec = "zlib"
+        self.offsets: list[int] = []
+        self.counts: list[int] = []
+        self.first_names: list[str] = []
+        self.damaged: set[int] = set()
+        self.buffer: mmap.mmap | None = None
+        self.file = None
+        self.cached: tuple[int, list[tuple[str, bytes]]] | None = None
+        if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+            return
+
+        self.file = open(filename, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"{filename} is not a block file")
+        magic, codec, count, index_offset, index_length, index_crc = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or codec not in CODEC_NAMES:
+            self.close()
+            raise ValueError(f"{filename} is not a block file")
+        self.codec = CODEC_NAMES[codec]
+
+        index = self.buffer[index_offset:index_offset + index_length]
+        if index_offset and len(index) == index_length and zlib.crc32(index) == index_crc:
+            self.__read_index(index)
+            self.__check_blocks()
+        else:
+            self.__scan_blocks()
+        self.count = sum(count for block, count in enumerate(self.counts) if block not in self.damaged)
+        self.lost = max(count - self.count, 0)
+
+        if self.damaged or self.lost:
+            print(f"⚠️ {filename} is damaged: {len(self.damaged)} block(s) failed their check, "
+                  f"{self.lost} record(s) could not be read.", file=sys.stderr)
+
+    def __read_index(self, index: bytes) -> None:
+        position = 0
+        while position < len(index):
+            offset, count, name_length = ENTRY.unpack_from(index, position)
+            position += ENTRY.size
+            self.offsets.append(offset)
+            self.counts.append(count)
+            self.first_names.append(index[position:position + name_length].decode())
+            position += name_length
+
+    def __check_blocks(self) -> None:
+        for block, offset in enumerate(self.offsets):
+            if self.__compressed(offset) is None:
+                self.damaged.add(block)
+
+    def __compressed(self, offset: int) -> bytes | None:
+        """
+        Compressed bytes of the block at the offset, None when they fail the check
+        """
+        if offset + BLOCK.size > len(self.buffer):
+            return None
+        length, _, crc = BLOCK.unpack_from(self.buffer, offset)
+        data = self.buffer[offset + BLOCK.size:offset + BLOCK.size + length]
+        return data if len(data) == length and zlib.crc32(data) == crc else None
+
+    def __scan_blocks(self) -> None:
+        """
+        Rebuilds the index from the blocks themselves, stops at the first
+        block that fails its check since its length cannot be trusted
+        """
+        offset = HEADER.size
+        while True:
+            data = self.__compressed(offset)
+            if data is None:
+                break
+            try:
+                pairs = pickle.loads(CODECS[self.codec][2](data))
+            except (pickle.UnpicklingError, zlib.error, lzma.LZMAError, EOFError, ValueError):
+                break
+            if not pairs:
+                break
+            self.offsets.append(offset)
+            self.counts.append(len(pairs))
+            self.first_names.append(pairs[0][0])
+            offset += BLOCK.size + len(data)
+        print(f"⚠️ Index of {self.filename} is damaged, recovered {len(self.offsets)} block(s).", file=sys.stderr)
+
+    def block(self, block: int) -> list[tuple[str, bytes]]:
+        """
+        (name, pickle) pairs of the block, empty for a damaged one
+        """
+        if self.cached is not None and self.cached[0] == block:
+            return self.cached[1]
+        pairs = []
+        if block not in self.damaged:
+            data = self.__compressed(self.offsets[block])
+            try:
+                pairs = pickle.loads(CODECS[self.codec][2](data))
+            except (TypeError, pickle.UnpicklingError, zlib.error, lzma.LZMAError, EOFError, ValueError):
+                self.damaged.add(block)
+                print(f"⚠️ Block {block} of {self.filename} is damaged and was skipped.", file=sys.stderr)
+        self.cached = (block, pairs)
+        return pairs
+
+    def find(self, name: str) -> tuple[int, int] | None:
+        block = bisect.bisect_right(self.first_names, name) - 1
+        if block < 0:
+            return None
+        pairs = self.block(block)
+        position = bisect.bisect_left(pairs, name, key=lambda pair: pair[0])
+        if position < len(pairs) and pairs[position][0] == name:
+            return block, position
+        return None
+
+    def blob(self, block: int, position: int) -> bytes:
+        return self.block(block)[position][1]
+
+    def names(self) -> Iterator[str]:
+        for name, _ in self.blobs():
+            yield name
+
+    def blobs(self) -> Iterator[tuple[str, bytes]]:
+        for block in range(len(self.offsets)):
+            yield from self.block(block)
+
+    def close(self) -> None:
+        self.cached = None
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    @staticmethod
+    def write(filename: str, blobs: Iterable[tuple[str, bytes]], codec: str = "zlib") -> None:
+        """
+        Writes (name, pickle) pairs, which must come sorted by name
+        """
+        number, compress, _ = CODECS[codec]
+        entries = []
+        count = 0
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, number, 0, 0, 0, 0))
+            offset = HEADER.size
+
+            def flush(pairs: list[tuple[str, bytes]]) -> int:
+                data = compress(pickle.dumps(pairs, protocol=pickle.HIGHEST_PROTOCOL))
+                f.write(BLOCK.pack(len(data), len(pairs), zlib.crc32(data)))
+                f.write(data)
+                name = pairs[0][0].encode()
+                entries.append(ENTRY.pack(offset, len(pairs), len(name)) + name)
+                return BLOCK.size + len(data)
+
+            pairs, size = [], 0
+            for name, blob in blobs:
+                pairs.append((name, blob))
+                size += len(name) + len(blob)
+                count += 1
+                if size >= BLOCK_SIZE:
+                    offset += flush(pairs)
+                    pairs, size = [], 0
+            if pairs:
+                offset += flush(pairs)
+
+            index = b"".join(entries)
+            f.write(index)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, number, count, offset, len(index), zlib.crc32(index)))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def keep_damaged(filename: str, file: BlockFile) -> None:
+    """
+    Copies a damaged file aside before it is replaced, so records of its
+    bad blocks can still be recovered by hand
+    """
+    if file.damaged or file.lost:
+        shutil.copyfile(filename, f"{filename}.damaged")
+        print(f"⚠️ Damaged {filename} was kept as {filename}.damaged.", file=sys.stderr)
+
+
+class BlockRecords(MmapRecords):
+    """
+    Mapping of names to records read lazily from a compressed block file,
+    reading a record decompresses only the block holding it
+    """
+
+    def __init__(self, filename: str, book: AddressBook, *, codec: str = "zlib"):
+        self.codec = codec
+        super().__init__(filename, book)
+
+    def open_file(self) -> BlockFile:
+        return BlockFile(self.filename)
+
+    def write_file(self, filename: str, blobs: Iterable[tuple[str, bytes]]) -> None:
+        BlockFile.write(filename, blobs, self.codec)
+
+    def save(self) -> None:
+        if self.changes and self.file.buffer is not None:
+            keep_damaged(self.filename, self.file)
+        super().save()
+
+
+class BlockAddressBook(MmapAddressBook):
+    """
+    Address book read on demand from a compressed block file
+    """
+
+    def __init__(self, filename: str = "addressbook.blk", *, codec: str = "zlib"):
+        self.codec = codec
+        super().__init__(filename)
+
+    def open_records(self, filename: str) -> BlockRecords:
+        return BlockRecords(filename, self, codec=self.codec)
+
+
+class BlockStorage(MmapStorage):
+    """
+    Keeps the address book and notes in compressed block files.
+
+    On first run existing pickled address book and notes are imported.
+    """
+
+    def __init__(self, *, book_file: str = "addressbook.blk", notes_file: str = "notes.blk",
+                 pickle_notes_file: str = "notes.pkl", codec: str = "zlib", **files):
+        super().__init__(book_file=book_file, notes_file=notes_file, **files)
+        self.pickle_notes_file = pickle_notes_file
+        self.codec = codec
+
+    def load_book(self) -> BlockAddressBook:
+        is_new = not os.path.exists(self.book_file)
+        self.book = BlockAddressBook(self.book_file, codec=self.codec)
+        if is_new and os.path.exists(self.pickle_book_file):
+            self.book.import_records(AddressBook.load(self.pickle_book_file).values())
+        return self.book
+
+    def load_notes(self) -> NotesManager:
+        if not os.path.exists(self.notes_file):
+            notes = NotesManager.load(self.pickle_notes_file)
+            if os.path.exists(self.pickle_notes_file):
+                self.save_notes(notes)
+            return notes
+
+        notes = NotesManager()
+        file = BlockFile(self.notes_file)
+        try:
+            for _, blob in file.blobs():
+                note = pickle.loads(blob)
+                notes.apply_change("put", note_key(note.title), note)
+        finally:
+            file.close()
+        notes.mark_saved(notes.changes)
+        return notes
+
+    def save_notes(self, notes: NotesManager) -> None:
+        changes = notes.changes
+        if os.path.exists(self.notes_file):
+            file = BlockFile(self.notes_file)
+            keep_damaged(self.notes_file, file)
+            file.close()
+
+        blobs = sorted((note_key(note.title), pickle.dumps(note, protocol=pickle.HIGHEST_PROTOCOL))
+                       for note in notes.notes)
+        tmp_filename = f"{self.notes_file}.tmp"
+        BlockFile.write(tmp_filename, blobs, self.codec)
+        os.replace(tmp_filename, self.notes_file)
+        notes.mark_saved(changes)
@@ -0,0 +1,68 @@
+import os
+import pickle
+import sys
+from typing import BinaryIO, Callable
+
+class Journal:
+    """
+    Append-only log of store changes kept next to a snapshot file.
+
+    Each entry is a pickled (op, key, value) tuple as reported by the store
+    observers. A torn entry at the end of the file (e.g. after a crash in
+    the middle of a write) is cut off on replay.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.entries = 0
+        self._file: BinaryIO | None = None
+
+    def replay(self, apply: Callable[[str, str, object], None]) -> int:
+        """
+        Applies every entry of the journal and returns their count
+        """
+        self.entries = 0
+        try:
+            f = open(self.filename, "rb")
+        except FileNotFoundError:
+            return 0
+
+        with f:
+            good_offset = 0
+            while True:
+                try:
+                    op, key, value = pickle.load(f)
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+                    print(f"⚠️ Journal {self.filename} is damaged, dropped changes after entry {self.entries}.", file=sys.stderr)
+                    break
+                apply(op, key, value)
+                self.entries += 1
+                good_offset = f.tell()
+
+        if good_offset != os.path.getsize(self.filename):
+            os.truncate(self.filename, good_offset)
+
+        return self.entries
+
+    def append(self, op: str, key: str, value: object) -> None:
+        if self._file is None:
+            self._file = open(self.filename, "ab")
+        pickle.dump((op, key, value), self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.flush()
+        self.entries += 1
+
+    def reset(self) -> None:
+        """
+        Empties the journal once its changes are part of a snapshot
+        """
+        self.close()
+        with open(self.filename, "wb"):
+            pass
+        self.entries = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
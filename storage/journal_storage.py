@@ -0,0 +1,73 @@
+import os
+import pickle
+
+from addressbook import AddressBook
+from notes import NotesManager
+
+from .journal import Journal
+from .pickle_storage import PickleStorage
+
+class JournalStorage(PickleStorage):
+    """
+    Keeps the pickle file as a snapshot and appends every change of a
+    record or note to a journal next to it, so a save only has to flush
+    what changed. The snapshot is rewritten (compacted) once the journal
+    grows past `compact_every` entries.
+    """
+
+    def __init__(self, *, compact_every: int = 10_000, **files):
+        super().__init__(**files)
+        self.compact_every = compact_every
+        self.book_journal = Journal(f"{self.book_file}.journal")
+        self.notes_journal = Journal(f"{self.notes_file}.journal")
+
+    def load_book(self) -> AddressBook:
+        book = super().load_book()
+        if self.book_journal.replay(book.apply_change) >= self.compact_every:
+            self.compact(book, self.book_file, self.book_journal)
+        book.subscribe(self.book_journal.append)
+        return book
+
+    def load_notes(self) -> NotesManager:
+        notes = super().load_notes()
+        if self.notes_journal.replay(notes.apply_change) >= self.compact_every:
+            self.compact(notes, self.notes_file, self.notes_journal)
+        notes.subscribe(self.notes_journal.append)
+        return notes
+
+    def save_book(self, book: AddressBook) -> None:
+        # every change is already in the journal
+        book.mark_saved(book.changes)
+        if self.should_compact(self.book_file, self.book_journal):
+            self.compact(book, self.book_file, self.book_journal)
+
+    def save_notes(self, notes: NotesManager) -> None:
+        notes.mark_saved(notes.changes)
+        if self.should_compact(self.notes_file, self.notes_journal):
+            self.compact(notes, self.notes_file, self.notes_journal)
+
+    def should_compact(self, filename: str, journal: Journal) -> bool:
+        # the first save also writes a snapshot, so that later loads do not
+        # report a missing file while all changes are still in the journal
+        return journal.entries >= self.compact_every or not os.path.exists(filename)
+
+    @staticmethod
+    def compact(store, filename: str, journal: Journal) -> None:
+        """
+        Writes a fresh snapshot of the store and empties its journal.
+
+        The snapshot is replaced atomically before the journal is reset,
+        replaying a journal over a snapshot that already contains its
+        changes is harmless.
+        """
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+        journal.reset()
+
+    def close(self) -> None:
+        self.book_journal.close()
+        self.notes_journal.close()
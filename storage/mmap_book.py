@@ -0,0 +1,283 @@
+import mmap
+import os
+import pickle
+import struct
+import weakref
+from collections.abc import Iterable, Iterator, MutableMapping
+
+from addressbook import AddressBook, Record
+
+from .pickle_storage import PickleStorage
+
+MAGIC = b"ABREC\x00\x00\x01"
+# magic, number of records, offset of the index
+HEADER = struct.Struct("<8sQQ")
+# offset of the record, length of its name, length of its pickle
+ENTRY = struct.Struct("<QII")
+
+
+class RecordFile:
+    """
+    Read-only view of a record file mapped into memory.
+
+    The file holds records as name and pickle bytes followed by an index
+    of fixed size entries sorted by name, so a record is found by binary
+    search and nothing but the touched records is ever decoded.
+    """
+
+    def __init__(self, filename: str):
+        self.count = 0
+        self.index_offset = 0
+        self.buffer: mmap.mmap | None = None
+        self.file = None
+        if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+            return
+
+        self.file = open(filename, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.index_offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a record file")
+
+    def entry(self, position: int) -> tuple[str, int, int]:
+        """
+        Returns name, offset and length of the pickle of the record at the position in the index
+        """
+        offset, name_length, data_length = ENTRY.unpack_from(self.buffer, self.index_offset + position * ENTRY.size)
+        name = self.buffer[offset:offset + name_length].decode()
+        return name, offset + name_length, data_length
+
+    def find(self, name: str) -> tuple[int, int] | None:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry_name, offset, length = self.entry(middle)
+            if entry_name == name:
+                return offset, length
+            if entry_name < name:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def blob(self, offset: int, length: int) -> bytes:
+        return self.buffer[offset:offset + length]
+
+    def names(self) -> Iterator[str]:
+        for position in range(self.count):
+            yield self.entry(position)[0]
+
+    def blobs(self) -> Iterator[tuple[str, bytes]]:
+        for position in range(self.count):
+            name, offset, length = self.entry(position)
+            yield name, self.blob(offset, length)
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    @staticmethod
+    def write(filename: str, blobs: Iterable[tuple[str, bytes]]) -> None:
+        """
+        Writes (name, pickle) pairs, which must come sorted by name
+        """
+        entries = []
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 0, 0))
+            offset = HEADER.size
+            for name, blob in blobs:
+                encoded = name.encode()
+                f.write(encoded)
+                f.write(blob)
+                entries.append(ENTRY.pack(offset, len(encoded), len(blob)))
+                offset += len(encoded) + len(blob)
+            f.write(b"".join(entries))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, len(entries), offset))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class MmapRecords(MutableMapping[str, Record]):
+    """
+    Mapping of names to records read lazily from a record file.
+
+    Changes are kept in memory until the book is saved, records read from
+    the file are kept only while something else references them.
+    """
+
+    def __init__(self, filename: str, book: AddressBook):
+        self.filename = filename
+        self.book = book
+        self.file = self.open_file()
+        self.changes: dict[str, Record | None] = {}
+        self.size = self.file.count
+        self.cache: weakref.WeakValueDictionary[str, Record] = weakref.WeakValueDictionary()
+
+    def open_file(self) -> RecordFile:
+        return RecordFile(self.filename)
+
+    def write_file(self, filename: str, blobs: Iterable[tuple[str, bytes]]) -> None:
+        RecordFile.write(filename, blobs)
+
+    def __getitem__(self, name: str) -> Record:
+        if name in self.changes:
+            record = self.changes[name]
+            if record is None:
+                raise KeyError(name)
+            return record
+        record = self.cache.get(name)
+        if record is not None:
+            return record
+        location = self.file.find(name)
+        if location is None:
+            raise KeyError(name)
+        record = pickle.loads(self.file.blob(*location))
+        record._book = self.book
+        self.cache[name] = record
+        return record
+
+    def __contains__(self, name) -> bool:
+        if name in self.changes:
+            return self.changes[name] is not None
+        return self.file.find(name) is not None
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        if name not in self:
+            self.size += 1
+        record._book = self.book
+        self.changes[name] = record
+        self.cache[name] = record
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.size -= 1
+        self.changes[name] = None
+        self.cache.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.file.names():
+            if self.changes.get(name, True) is not None:
+                yield name
+        for name, record in self.changes.items():
+            if record is not None and self.file.find(name) is None:
+                yield name
+
+    def __len__(self) -> int:
+        return self.size
+
+    def values(self) -> Iterator[Record]:
+        return (self[name] for name in self)
+
+    def items(self) -> Iterator[tuple[str, Record]]:
+        return ((name, self[name]) for name in self)
+
+    def merged_blobs(self) -> Iterator[tuple[str, bytes]]:
+        """
+        Yields (name, pickle) pairs of the current state sorted by name,
+        pickles of unchanged records are copied from the file as they are
+        """
+        changed = sorted(self.changes)
+        position = 0
+        for name, blob in self.file.blobs():
+            while position < len(changed) and changed[position] < name:
+                yield from self.__changed_blob(changed[position])
+                position += 1
+            if position < len(changed) and changed[position] == name:
+                yield from self.__changed_blob(name)
+                position += 1
+            else:
+                yield name, blob
+        for name in changed[position:]:
+            yield from self.__changed_blob(name)
+
+    def __changed_blob(self, name: str) -> Iterator[tuple[str, bytes]]:
+        record = self.changes[name]
+        if record is not None:
+            yield name, pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save(self) -> None:
+        if not self.changes and os.path.exists(self.filename):
+            return
+        tmp_filename = f"{self.filename}.tmp"
+        self.write_file(tmp_filename, self.merged_blobs())
+        self.file.close()
+        os.replace(tmp_filename, self.filename)
+        self.file = self.open_file()
+        self.changes = {}
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class MmapAddressBook(AddressBook):
+    """
+    Address book read on demand from a memory-mapped record file.
+
+    Opening does not depend on the size of the book, `find` and paging
+    through contacts decode only the records they return. Searches and
+    birthday queries build their indexes from all records on first use.
+    """
+
+    def __init__(self, filename: str = "addressbook.rec"):
+        super().__init__()
+        self.data = self.open_records(filename)
+
+    def open_records(self, filename: str) -> MmapRecords:
+        return MmapRecords(filename, self)
+
+    def _record_changed(self, record: Record) -> None:
+        self.data[record.name.value] = record
+        super()._record_changed(record)
+
+    def import_records(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.data[record.name.value] = record
+        self.data.save()
+
+    def save(self, filename=None) -> None:
+        changes = self.changes
+        self.data.save()
+        self.mark_saved(changes)
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __getstate__(self):
+        raise TypeError(f"{type(self).__name__} is stored in its record file and cannot be pickled")
+
+
+class MmapStorage(PickleStorage):
+    """
+    Keeps the address book in a memory-mapped record file and notes in a
+    pickle file.
+
+    On first run an existing pickled address book is imported into the
+    record file.
+    """
+
+    def __init__(self, *, book_file: str = "addressbook.rec", pickle_book_file: str = "addressbook.pkl", **files):
+        super().__init__(book_file=book_file, **files)
+        self.pickle_book_file = pickle_book_file
+        self.book: MmapAddressBook | None = None
+
+    def load_book(self) -> MmapAddressBook:
+        is_new = not os.path.exists(self.book_file)
+        self.book = MmapAddressBook(self.book_file)
+        if is_new and os.path.exists(self.pickle_book_file):
+            self.book.import_records(AddressBook.load(self.pickle_book_file).values())
+        return self.book
+
+    def save_book(self, book: MmapAddressBook) -> None:
+        book.save()
+
+    def close(self) -> None:
+        if self.book is not None:
+            self.book.close()
+            self.book = None
@@ -0,0 +1,26 @@
+from addressbook import AddressBook
+from notes import NotesManager
+
+class PickleStorage:
+    """
+    Keeps each store in a single pickle file that is rewritten on every save
+    """
+
+    def __init__(self, *, book_file: str = "addressbook.pkl", notes_file: str = "notes.pkl"):
+        self.book_file = book_file
+        self.notes_file = notes_file
+
+    def load_book(self) -> AddressBook:
+        return AddressBook.load(self.book_file)
+
+    def load_notes(self) -> NotesManager:
+        return NotesManager.load(self.notes_file)
+
+    def save_book(self, book: AddressBook) -> None:
+        book.save(self.book_file)
+
+    def save_notes(self, notes: NotesManager) -> None:
+        notes.save(self.notes_file)
+
+    def close(self) -> None:
+        pass
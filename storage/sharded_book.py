@@ -0,0 +1,214 @@
+import gc
+import json
+import os
+import pickle
+import shutil
+import sys
+import zlib
+from collections.abc import Iterable, Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+
+from addressbook import AddressBook, Record
+
+from .pickle_storage import PickleStorage
+
+MANIFEST = "manifest.json"
+
+
+def shard_of(name: str, count: int) -> int:
+    """
+    Shard of a record by its name, stable across runs unlike `hash()`
+    """
+    return zlib.crc32(name.encode()) % count
+
+
+@contextmanager
+def gc_paused():
+    """
+    Keeps the cyclic garbage collector off, unpickling creates lots of
+    objects and would otherwise trigger collections over the whole heap
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ShardedRecords(MutableMapping[str, Record]):
+    """
+    Mapping of names to records split into shards by hash of the name, each
+    shard kept in its own pickle file in a directory.
+
+    Shards are read and written by a thread pool. Only shards with changed
+    records are rewritten on save.
+    """
+
+    def __init__(self, directory: str, book: AddressBook, *, shards: int = 16, workers: int | None = None):
+        self.directory = directory
+        self.book = book
+        self.workers = workers or min(shards, os.cpu_count() or 1)
+        self.count = self.__read_manifest() or shards
+        with gc_paused(), ThreadPoolExecutor(self.workers) as executor:
+            self.shards: list[dict[str, Record]] = list(executor.map(self.__load_shard, range(self.count)))
+        self.dirty: set[int] = set()
+        if self.count != shards:
+            self.reshard(shards)
+
+    def __read_manifest(self) -> int | None:
+        try:
+            with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)["shards"]
+        except FileNotFoundError:
+            return None
+
+    def __write_manifest(self) -> None:
+        with open(os.path.join(self.directory, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"shards": self.count}, f)
+
+    def shard_file(self, shard: int) -> str:
+        return os.path.join(self.directory, f"{shard:03d}.pkl")
+
+    def __load_shard(self, shard: int) -> dict[str, Record]:
+        try:
+            with open(self.shard_file(shard), "rb") as f:
+                records = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except (EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+            # the shard is rewritten from what is left on the next change
+            # of a contact in it, the damaged file is kept for recovery by hand
+            filename = self.shard_file(shard)
+            shutil.copyfile(filename, f"{filename}.damaged")
+            print(f"⚠️ Shard {filename} is damaged, its contacts were not loaded, "
+                  f"the file was kept as {filename}.damaged.", file=sys.stderr)
+            return {}
+        for record in records.values():
+            record._book = self.book
+        return records
+
+    def __save_shard(self, shard: int) -> None:
+        filename = self.shard_file(shard)
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            pickle.dump(self.shards[shard], f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+
+    def reshard(self, count: int) -> None:
+        """
+        Spreads the records over a new number of shards, all of them are
+        rewritten on the next save
+        """
+        records = list(chain.from_iterable(shard.items() for shard in self.shards))
+        self.count = count
+        self.shards = [{} for _ in range(count)]
+        for name, record in records:
+            self.shards[shard_of(name, count)][name] = record
+        self.dirty = set(range(count))
+
+    def __shard(self, name: str) -> dict[str, Record]:
+        return self.shards[shard_of(name, self.count)]
+
+    def __getitem__(self, name: str) -> Record:
+        return self.__shard(name)[name]
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name in self.__shard(name)
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        shard = shard_of(name, self.count)
+        record._book = self.book
+        self.shards[shard][name] = record
+        self.dirty.add(shard)
+
+    def __delitem__(self, name: str) -> None:
+        shard = shard_of(name, self.count)
+        del self.shards[shard][name]
+        self.dirty.add(shard)
+
+    def __iter__(self) -> Iterator[str]:
+        return chain.from_iterable(self.shards)
+
+    def __len__(self) -> int:
+        return sum(map(len, self.shards))
+
+    def values(self) -> Iterator[Record]:
+        return chain.from_iterable(shard.values() for shard in self.shards)
+
+    def items(self) -> Iterator[tuple[str, Record]]:
+        return chain.from_iterable(shard.items() for shard in self.shards)
+
+    def save(self) -> None:
+        if not self.dirty and os.path.exists(os.path.join(self.directory, MANIFEST)):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        dirty, self.dirty = sorted(self.dirty), set()
+        with ThreadPoolExecutor(self.workers) as executor:
+            list(executor.map(self.__save_shard, dirty))
+        self.__write_manifest()
+        for filename in os.listdir(self.directory):
+            # left over from a larger number of shards
+            stem, extension = os.path.splitext(filename)
+            if extension == ".pkl" and stem.isdigit() and int(stem) >= self.count:
+                os.remove(os.path.join(self.directory, filename))
+
+
+class ShardedAddressBook(AddressBook):
+    """
+    Address book split into shards by hash of the contact name.
+
+    `find` goes straight to the shard owning the name, saving rewrites
+    only the shards that changed.
+    """
+
+    def __init__(self, directory: str = "addressbook.shards", *, shards: int = 16):
+        super().__init__()
+        self.data = ShardedRecords(directory, self, shards=shards)
+
+    def _record_changed(self, record: Record) -> None:
+        self.data[record.name.value] = record
+        super()._record_changed(record)
+
+    def import_records(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.data[record.name.value] = record
+        self.data.save()
+
+    def save(self, filename=None) -> None:
+        changes = self.changes
+        self.data.save()
+        self.mark_saved(changes)
+
+    def __getstate__(self):
+        raise TypeError("ShardedAddressBook is stored in its shard files and cannot be pickled")
+
+
+class ShardedStorage(PickleStorage):
+    """
+    Keeps the address book in a directory of shard files and notes in a
+    pickle file.
+
+    On first run an existing pickled address book is imported into the shards.
+    """
+
+    def __init__(self, *, book_file: str = "addressbook.shards", pickle_book_file: str = "addressbook.pkl",
+                 shards: int = 16, **files):
+        super().__init__(book_file=book_file, **files)
+        self.pickle_book_file = pickle_book_file
+        self.shards = shards
+
+    def load_book(self) -> ShardedAddressBook:
+        is_new = not os.path.exists(self.book_file)
+        book = ShardedAddressBook(self.book_file, shards=self.shards)
+        if is_new and os.path.exists(self.pickle_book_file):
+            book.import_records(AddressBook.load(self.pickle_book_file).values())
+        return book
+
+    def save_book(self, book: ShardedAddressBook) -> None:
+        book.save()
@@ -0,0 +1,243 @@
+import fcntl
+import os
+import pickle
+import struct
+import sys
+from collections.abc import Callable, Iterator
+
+from addressbook import AddressBook, EmailExistsError, PhoneExistsError
+from notes import Note, NotesManager, note_key
+
+from .pickle_storage import PickleStorage
+
+# version of the store, version the snapshot was written at
+HEADER = struct.Struct("<QQ")
+
+
+def store_items(store) -> Iterator[tuple[str, object]]:
+    if isinstance(store, NotesManager):
+        return ((note_key(note.title), note) for note in store.get_all_notes())
+    return iter(list(store.items()))
+
+
+def value_key(value) -> str:
+    """
+    Key a record or note is stored under after a change
+    """
+    if isinstance(value, Note):
+        return note_key(value.title)
+    return value.name.value
+
+
+class SharedStore:
+    """
+    One store (address book or notes) shared by several processes.
+
+    The pickle file is a snapshot and every save appends the changed
+    records to a journal next to it. A lock file holds the version of the
+    store (the number of changes ever saved) and the version of the
+    snapshot, and is locked with `flock` while the store is read or saved.
+
+    A save first applies the changes other processes saved since this one
+    last synced, only reading their part of the journal, then appends its
+    own. When both changed the same record, the later save wins. A renamed
+    note is saved as a delete of its old title and a put of the new one, so
+    a note renamed in one process and edited under its old title in a later
+    save of another ends up as two notes, the same in every process.
+
+    The first save also writes the snapshot, so loads never start from a
+    missing file.
+    """
+
+    def __init__(self, filename: str, load: Callable[[str], object], *, compact_every: int = 10_000):
+        self.filename = filename
+        self.load_snapshot = load
+        self.compact_every = compact_every
+        self.journal_filename = f"{filename}.changes"
+        self.lock_file = open(f"{filename}.lock", "a+b")
+        self.version = 0
+        self.snapshot_version = 0
+        self.offset = 0
+        self.pending: dict[str, tuple[str, object]] = {}
+        self.applying = False
+
+    def read_header(self) -> tuple[int, int]:
+        self.lock_file.seek(0)
+        data = self.lock_file.read(HEADER.size)
+        return HEADER.unpack(data) if len(data) == HEADER.size else (0, 0)
+
+    def write_header(self) -> None:
+        self.lock_file.seek(0)
+        self.lock_file.truncate()
+        self.lock_file.write(HEADER.pack(self.version, self.snapshot_version))
+        self.lock_file.flush()
+
+    def changed(self, op: str, key: str, value) -> None:
+        """
+        Store observer, remembers the changes made by this process
+        """
+        if self.applying:
+            return
+        if op == "put" and value_key(value) != key:
+            self.__remember("delete", key, None)
+            key = value_key(value)
+        self.__remember(op, key, value)
+
+    def __remember(self, op: str, key: str, value) -> None:
+        # kept in the order of the latest change of each key
+        self.pending.pop(key, None)
+        self.pending[key] = (op, value)
+
+    def load(self):
+        fcntl.flock(self.lock_file, fcntl.LOCK_SH)
+        try:
+            version, self.snapshot_version = self.read_header()
+            store = self.load_snapshot(self.filename)
+            self.version = self.snapshot_version
+            self.offset = 0
+            self.__read_journal(lambda op, key, value: store.apply_change(op, key, value))
+            if self.version != version:
+                print(f"⚠️ {self.filename} is at version {self.version}, expected {version}.", file=sys.stderr)
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        store.subscribe(self.changed)
+        return store
+
+    def save(self, store) -> None:
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        try:
+            version, snapshot_version = self.read_header()
+            if version != self.version or snapshot_version != self.snapshot_version:
+                self.__catch_up(store, snapshot_version)
+
+            changes = store.changes
+            if self.pending:
+                self.__append()
+            if self.version - self.snapshot_version >= self.compact_every or not os.path.exists(self.filename):
+                self.__compact(store)
+            self.write_header()
+            store.mark_saved(changes)
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def __read_journal(self, apply: Callable[[str, str, object], None]) -> None:
+        """
+        Applies the journal entries after the offset this process read up to
+        """
+        try:
+            f = open(self.journal_filename, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self.offset)
+            while True:
+                try:
+                    op, key, value = pickle.load(f)
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+                    print(f"⚠️ Journal {self.journal_filename} is damaged after version {self.version}.",
+                          file=sys.stderr)
+                    break
+                apply(op, key, value)
+                self.version += 1
+                self.offset = f.tell()
+
+    def __apply_foreign(self, store, op: str, key: str, value) -> None:
+        # a record changed here too is overwritten by this save anyway
+        if key in self.pending:
+            return
+        try:
+            store.apply_change(op, key, value)
+        except (PhoneExistsError, EmailExistsError) as e:
+            print(f"⚠️ Change of {key} saved by another process was skipped: {e}", file=sys.stderr)
+
+    def __catch_up(self, store, snapshot_version: int) -> None:
+        """
+        Applies changes saved by other processes since this one last synced
+        """
+        self.applying = True
+        try:
+            if snapshot_version == self.snapshot_version:
+                self.__read_journal(lambda op, key, value: self.__apply_foreign(store, op, key, value))
+                return
+
+            if snapshot_version == self.version:
+                # compacted by another process right after this one synced
+                self.snapshot_version = snapshot_version
+                self.offset = 0
+                self.__read_journal(lambda op, key, value: self.__apply_foreign(store, op, key, value))
+                return
+
+            # the journal entries this process has not seen were compacted
+            # into the snapshot, so the whole store has to be compared
+            fresh = self.load_snapshot(self.filename)
+            self.snapshot_version = self.version = snapshot_version
+            self.offset = 0
+            self.__read_journal(lambda op, key, value: fresh.apply_change(op, key, value))
+            fresh_keys = set()
+            for key, value in store_items(fresh):
+                fresh_keys.add(key)
+                self.__apply_foreign(store, "put", key, value)
+            for key, _ in store_items(store):
+                if key not in fresh_keys:
+                    self.__apply_foreign(store, "delete", key, None)
+        finally:
+            self.applying = False
+
+    def __append(self) -> None:
+        # cut off a torn entry left by a process that died while saving
+        if os.path.exists(self.journal_filename) and os.path.getsize(self.journal_filename) > self.offset:
+            os.truncate(self.journal_filename, self.offset)
+        with open(self.journal_filename, "ab") as f:
+            for key, (op, value) in self.pending.items():
+                pickle.dump((op, key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+            self.offset = f.tell()
+        self.version += len(self.pending)
+        self.pending = {}
+
+    def __compact(self, store) -> None:
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, "wb") as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+        with open(self.journal_filename, "wb"):
+            pass
+        self.snapshot_version = self.version
+        self.offset = 0
+
+    def close(self) -> None:
+        self.lock_file.close()
+
+
+class SharedStorage(PickleStorage):
+    """
+    Lets several bots work on the same pickle files: each store keeps a
+    version and a journal of saved changes, saves take a file lock and
+    merge the changes of other processes record by record.
+    """
+
+    def __init__(self, *, compact_every: int = 10_000, **files):
+        super().__init__(**files)
+        self.book_store = SharedStore(self.book_file, AddressBook.load, compact_every=compact_every)
+        self.notes_store = SharedStore(self.notes_file, NotesManager.load, compact_every=compact_every)
+
+    def load_book(self) -> AddressBook:
+        return self.book_store.load()
+
+    def load_notes(self) -> NotesManager:
+        return self.notes_store.load()
+
+    def save_book(self, book: AddressBook) -> None:
+        self.book_store.save(book)
+
+    def save_notes(self, notes: NotesManager) -> None:
+        self.notes_store.save(notes)
+
+    def close(self) -> None:
+        self.book_store.close()
+        self.notes_store.close()
@@ -0,0 +1,256 @@
+import os
+import pickle
+import sqlite3
+import weakref
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime
+
+from addressbook import (AddressBook, Email, Phone, Record, birthday_key_ranges,
+                         record_birthday_key, record_emails, record_phones)
+
+from .pickle_storage import PickleStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    record BLOB NOT NULL,
+    birthday_key INTEGER,
+    search_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_birthday_key ON contacts(birthday_key);
+CREATE TABLE IF NOT EXISTS contact_keys (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS contact_keys_value ON contact_keys(kind, value);
+CREATE INDEX IF NOT EXISTS contact_keys_contact_id ON contact_keys(contact_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+    search_text, content='contacts', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_fts(contacts_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+    INSERT INTO contacts_fts(contacts_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    INSERT INTO contacts_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+"""
+
+# trigram index can only answer terms of at least this length
+FTS_MIN_TERM = 3
+# stored in PRAGMA user_version, 1 added the contact_keys index
+SCHEMA_VERSION = 1
+
+
+class SqliteRecords(MutableMapping[str, Record]):
+    """
+    Mapping of names to records stored in a sqlite table.
+
+    Records are unpickled on access and kept only while something else
+    references them, so memory does not depend on the size of the book.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, book: AddressBook):
+        self.connection = connection
+        self.book = book
+        self.cache: weakref.WeakValueDictionary[str, Record] = weakref.WeakValueDictionary()
+
+    def load(self, name: str, blob: bytes) -> Record:
+        record = self.cache.get(name)
+        if record is None:
+            record = pickle.loads(blob)
+            record._book = self.book
+            self.cache[name] = record
+        return record
+
+    def __getitem__(self, name: str) -> Record:
+        record = self.cache.get(name)
+        if record is not None:
+            return record
+        row = self.connection.execute("SELECT record FROM contacts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return self.load(name, row[0])
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        record._book = self.book
+        self.cache[name] = record
+        self.connection.execute(
+            "INSERT INTO contacts(name, record, birthday_key, search_text) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET record = excluded.record, "
+            "birthday_key = excluded.birthday_key, search_text = excluded.search_text",
+            (
+                name,
+                pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL),
+                record_birthday_key(record),
+                "\n".join(record.search_fields()),
+            ),
+        )
+        (contact_id,) = self.connection.execute("SELECT id FROM contacts WHERE name = ?", (name,)).fetchone()
+        self.connection.execute("DELETE FROM contact_keys WHERE contact_id = ?", (contact_id,))
+        self.connection.executemany(
+            "INSERT INTO contact_keys(kind, value, contact_id) VALUES (?, ?, ?)",
+            [("phone", phone, contact_id) for phone in record_phones(record)]
+            + [("email", email, contact_id) for email in record_emails(record)],
+        )
+
+    def __delitem__(self, name: str) -> None:
+        cursor = self.connection.execute("DELETE FROM contacts WHERE name = ?", (name,))
+        if cursor.rowcount == 0:
+            raise KeyError(name)
+        self.cache.pop(name, None)
+
+    def __contains__(self, name) -> bool:
+        return self.connection.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (name,) in self.connection.execute("SELECT name FROM contacts ORDER BY id"):
+            yield name
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def values(self) -> Iterator[Record]:
+        return self.select("")
+
+    def items(self) -> Iterator[tuple[str, Record]]:
+        return ((record.name.value, record) for record in self.values())
+
+    def select(self, where: str, params: tuple = (), limit: str = "") -> Iterator[Record]:
+        query = f"SELECT name, record FROM contacts {where} ORDER BY contacts.id {limit}"
+        for name, blob in self.connection.execute(query, params):
+            yield self.load(name, blob)
+
+
+class SqliteAddressBook(AddressBook):
+    """
+    Address book kept in a sqlite database instead of memory.
+
+    Every change is written to the database right away and committed on
+    save. Searches use a trigram full text index and birthday queries use
+    an index on month and day of birth.
+    """
+
+    def __init__(self, filename: str = "addressbook.db"):
+        super().__init__()
+        # loaded and autosaved in other threads, access is serialized by AppState.lock
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # sqlite built without fts5 or trigram tokenizer
+            self.has_fts = False
+        self.connection.commit()
+        self.data = SqliteRecords(self.connection, self)
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            if version < 1 and len(self.data):
+                # database created before phones and emails were indexed
+                self.import_records(list(self.data.values()))
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.connection.commit()
+
+    def _record_changed(self, record: Record) -> None:
+        self.data[record.name.value] = record
+        super()._record_changed(record)
+
+    def search(self, term: str) -> list[Record]:
+        needle = term.strip().lower()
+        if self.has_fts and len(needle) >= FTS_MIN_TERM:
+            phrase = '"' + needle.replace('"', '""') + '"'
+            candidates = self.data.select(
+                "JOIN contacts_fts ON contacts_fts.rowid = contacts.id WHERE contacts_fts MATCH ?",
+                (phrase,),
+            )
+        else:
+            escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            candidates = self.data.select("WHERE search_text LIKE ? ESCAPE '\\'", (f"%{escaped}%",))
+        return [record for record in candidates if record.check(term)]
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        return self.__find_by_key("phone", Phone.normalize(phone))
+
+    def find_by_email(self, email: str) -> list[Record]:
+        return self.__find_by_key("email", Email.normalize(email))
+
+    def __find_by_key(self, kind: str, value: str) -> list[Record]:
+        return list(self.data.select(
+            "WHERE id IN (SELECT contact_id FROM contact_keys WHERE kind = ? AND value = ?)",
+            (kind, value),
+        ))
+
+    def get_upcoming_birthday(self, limit=7) -> list:
+        today_date = datetime.today().date()
+        congrat_list = []
+
+        for low, high in birthday_key_ranges(today_date, limit):
+            for record in self.data.select("WHERE birthday_key BETWEEN ? AND ?", (low, high)):
+                congratulation = self._congratulation(record, today_date, limit)
+                if congratulation:
+                    congrat_list.append(congratulation)
+
+        return congrat_list
+
+    def list_records(self) -> list[Record]:
+        return list(self.data.values())
+
+    def records_page(self, start: int, count: int) -> list[Record]:
+        return list(self.data.select("", (count, start), limit="LIMIT ? OFFSET ?"))
+
+    def import_records(self, records) -> None:
+        for record in records:
+            self.data[record.name.value] = record
+        self.connection.commit()
+
+    def save(self, filename=None) -> None:
+        changes = self.changes
+        self.connection.commit()
+        self.mark_saved(changes)
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    def __getstate__(self):
+        raise TypeError("SqliteAddressBook is stored in its database and cannot be pickled")
+
+
+class SqliteStorage(PickleStorage):
+    """
+    Keeps the address book in a sqlite database and notes in a pickle file.
+
+    On first run an existing pickled address book is imported into the
+    database.
+    """
+
+    def __init__(self, *, book_file: str = "addressbook.db", pickle_book_file: str = "addressbook.pkl", **files):
+        super().__init__(book_file=book_file, **files)
+        self.pickle_book_file = pickle_book_file
+        self.book: SqliteAddressBook | None = None
+
+    def load_book(self) -> SqliteAddressBook:
+        is_new = not os.path.exists(self.book_file)
+        self.book = SqliteAddressBook(self.book_file)
+        if is_new and os.path.exists(self.pickle_book_file):
+            self.book.import_records(AddressBook.load(self.pickle_book_file).values())
+        return self.book
+
+    def save_book(self, book: SqliteAddressBook) -> None:
+        book.save()
+
+    def close(self) -> None:
+        if self.book is not None:
+            self.book.close()
+            self.book = None
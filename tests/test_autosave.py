@@ -0,0 +1,48 @@
+import threading
+import unittest
+from unittest import mock
+
+from addressbook import AddressBook
+from app_context import AppContext
+from app_state import AppState
+from bot import run_command
+from notes import NotesManager
+
+
+def lock_is_free(lock) -> bool:
+    """
+    Whether another thread, e.g. the autosaver, could take the lock now
+    """
+    free = []
+
+    def take():
+        if lock.acquire(timeout=1):
+            lock.release()
+            free.append(True)
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    thread.join()
+    return bool(free)
+
+
+class CommandLockTest(unittest.TestCase):
+    def test_prompts_do_not_hold_lock(self):
+        state = AppState(notes=NotesManager(), book=AddressBook())
+        context = AppContext(state=state, interface=mock.Mock())
+        answers = iter(["Shopping", "milk", "home"])
+        free_at_prompt = []
+
+        def ask(message, optional=False):
+            free_at_prompt.append(lock_is_free(state.lock))
+            return next(answers)
+
+        with mock.patch("commands.notes_add.ask", ask):
+            run_command(context, "add note")
+
+        self.assertEqual(free_at_prompt, [True, True, True])
+        self.assertEqual(state.notes.find_note_by_title("shopping").tags, ["home"])
+
+
+if __name__ == "__main__":
+    unittest.main()
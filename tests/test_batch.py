@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+from addressbook import AddressBook
+from app_context import AppContext
+from app_state import AppState
+from bot import run_batch
+from interface.prompt_script import prompt_script
+from notes import NotesManager
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.state = AppState(notes=NotesManager(), book=AddressBook())
+        self.state.save = mock.Mock()
+        self.interface = mock.Mock()
+        self.context = AppContext(state=self.state, interface=self.interface)
+
+    def failures(self) -> list[str]:
+        return [call.args[0] for call in self.interface.draw_failure.call_args_list]
+
+    def test_runs_commands_with_answers(self):
+        failed = run_batch(self.context, [
+            '# contacts',
+            'add contact "John Smith" 0501234567 john@example.com 01.02.1990 Kyiv',
+            'add contact Jane 0931234567',
+            '',
+            'add note Shopping milk home',
+        ], save_every=2)
+
+        self.assertEqual(failed, 0)
+        john = self.state.book.find("John smith")
+        self.assertEqual((john.phones[0].value, john.address.value), ("0501234567", "Kyiv"))
+        self.assertEqual(self.state.book.find("Jane").emails, [])
+        self.assertEqual(self.state.notes.find_note_by_title("shopping").tags, ["home"])
+        self.assertEqual(self.state.save.call_count, 1)
+
+    def test_failing_lines_are_counted(self):
+        failed = run_batch(self.context, [
+            'add contact John 123',
+            'add note',
+            'fly away',
+            'add contact "Jane',
+            'add contact Jim 0631234567',
+        ])
+
+        self.assertEqual(failed, 4)
+        self.assertEqual(self.failures(), ["line 1: add contact: Wrong phone format.",
+                                           "line 2: add note: No answer for 'Enter note title'",
+                                           "line 3: Invalid command fly",
+                                           "line 4: No closing quotation"])
+        self.assertEqual([record.name.value for record in self.state.book.values()], ["Jim"])
+        self.assertFalse(prompt_script.active)
+
+    def test_unused_answers_are_reported(self):
+        self.assertEqual(run_batch(self.context, ['add contact John 0501234567 "" "" "" extra']), 0)
+        self.interface.draw_warning.assert_called_once_with("line 1: add contact: unused arguments extra")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from storage import BlockStorage
+from storage.block_book import BLOCK, BlockFile
+
+
+class BlockStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # first loads report the missing files
+        self.stderr = self.enterContext(redirect_stderr(io.StringIO()))
+        self.book_file = os.path.join(self.directory.name, "addressbook.blk")
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.close()
+        self.directory.cleanup()
+
+    def storage(self, codec: str = "zlib") -> BlockStorage:
+        storage = BlockStorage(book_file=self.book_file,
+                               notes_file=os.path.join(self.directory.name, "notes.blk"),
+                               pickle_book_file=os.path.join(self.directory.name, "addressbook.pkl"),
+                               pickle_notes_file=os.path.join(self.directory.name, "notes.pkl"),
+                               codec=codec)
+        self.storages.append(storage)
+        return storage
+
+    def fill(self, storage: BlockStorage, count: int = 1000) -> None:
+        book = storage.load_book()
+        for number in range(count):
+            record = book.add(f"Contact {number:04d}")
+            record.add_phone(f"050{number:07d}")
+            # random enough not to compress into a single block
+            record.set_address(os.urandom(60).hex())
+        storage.save_book(book)
+        storage.close()
+
+    def test_round_trip(self):
+        for codec in ("zlib", "lzma"):
+            with self.subTest(codec=codec):
+                for filename in os.listdir(self.directory.name):
+                    os.remove(os.path.join(self.directory.name, filename))
+                storage = self.storage(codec)
+                self.fill(storage)
+                notes = storage.load_notes()
+                notes.add_note("Shopping", "milk", ["home"])
+                storage.save_notes(notes)
+
+                storage = self.storage(codec)
+                book = storage.load_book()
+                self.assertEqual(len(book), 1000)
+                self.assertEqual(book.find("Contact 0123").phones[0].value, "0500000123")
+                self.assertEqual(storage.load_notes().find_note_by_title("shopping").tags, ["home"])
+
+                file = BlockFile(self.book_file)
+                self.assertEqual(file.codec, codec)
+                self.assertGreater(len(file.offsets), 1)
+                file.close()
+
+    def test_reads_file_of_other_codec(self):
+        self.fill(self.storage("lzma"))
+        storage = self.storage("zlib")
+        book = storage.load_book()
+        self.assertEqual(len(book), 1000)
+
+        book.add("Jane")
+        storage.save_book(book)
+        storage.close()
+        file = BlockFile(self.book_file)
+        self.assertEqual((file.codec, file.count), ("zlib", 1001))
+        file.close()
+
+    def test_damaged_block(self):
+        self.fill(self.storage())
+        file = BlockFile(self.book_file)
+        offset, lost = file.offsets[1], file.counts[1]
+        file.close()
+        with open(self.book_file, "r+b") as f:
+            f.seek(offset + BLOCK.size + 10)
+            f.write(b"damaged")
+
+        storage = self.storage()
+        with redirect_stderr(io.StringIO()) as stderr:
+            book = storage.load_book()
+        self.assertIn("is damaged", stderr.getvalue())
+        self.assertEqual(len(book), 1000 - lost)
+        self.assertIsNotNone(book.find("Contact 0000"))
+        self.assertIsNotNone(book.find("Contact 0999"))
+
+        book.add("Jane")
+        storage.save_book(book)
+        self.assertTrue(os.path.exists(f"{self.book_file}.damaged"))
+        self.assertEqual(len(self.storage().load_book()), 1001 - lost)
+
+    def test_damaged_index(self):
+        self.fill(self.storage())
+        with open(self.book_file, "r+b") as f:
+            f.truncate(os.path.getsize(self.book_file) - 5)
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            book = self.storage().load_book()
+        self.assertIn("Index", stderr.getvalue())
+        self.assertEqual(len(book), 1000)
+        self.assertIsNotNone(book.find("Contact 0500"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from addressbook import AddressBook
+from bulk_export import export_contacts, export_notes
+from bulk_import import import_contacts
+from notes import NotesManager
+
+
+class BulkExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.book = AddressBook()
+        john = self.book.add("John")
+        john.add_phone("0501234567")
+        john.add_phone("0671234567")
+        john.add_email("john@example.com")
+        john.set_birthday("01.02.1990")
+        john.set_address("Main street, 1; Kyiv")
+        self.book.add("Jane").add_phone("0931234567")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory.name, filename)
+
+    def test_csv(self):
+        self.assertEqual(export_contacts(self.book, self.path("contacts.csv")), 2)
+
+        with open(self.path("contacts.csv"), newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0], {"name": "John", "phones": "0501234567; 0671234567",
+                                   "emails": "john@example.com", "birthday": "01.02.1990",
+                                   "address": "Main street, 1; Kyiv"})
+
+    def test_jsonl_with_search_term(self):
+        self.assertEqual(export_contacts(self.book, self.path("contacts.jsonl"), term="093"), 1)
+
+        with open(self.path("contacts.jsonl"), encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([(row["name"], row["phones"]) for row in rows], [("Jane", ["0931234567"])])
+
+    def test_tsv_escapes_values(self):
+        notes = NotesManager()
+        notes.add_note("Plan", "first\tsecond\nthird", ["work", "home"])
+        export_notes(notes, self.path("notes.tsv"))
+
+        with open(self.path("notes.tsv"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1].split("\t")[:3], ["Plan", "first\\tsecond\\nthird", "work; home"])
+
+    def test_round_trip_through_import(self):
+        for filename in ("contacts.csv", "contacts.vcf"):
+            with self.subTest(filename=filename):
+                export_contacts(self.book, self.path(filename))
+                book = AddressBook()
+                report = import_contacts(book, self.path(filename), workers=1)
+
+                self.assertEqual((report.imported, report.errors), (2, []))
+                john = book.find("John")
+                self.assertEqual([phone.value for phone in john.phones], ["0501234567", "0671234567"])
+                self.assertEqual(john.emails[0].value, "john@example.com")
+                self.assertEqual(john.birthday.stringify_date(), "01.02.1990")
+
+    def test_unsupported_formats(self):
+        with self.assertRaises(ValueError):
+            export_contacts(self.book, self.path("contacts.xml"))
+        with self.assertRaises(ValueError):
+            export_notes(NotesManager(), self.path("notes.vcf"))
+
+
+if __name__ == "__main__":
+    unittest.main()
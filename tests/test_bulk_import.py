@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from addressbook import AddressBook
+from bulk_import import ImportReport, import_contacts
+
+
+class BulkImportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.book = AddressBook()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, filename: str, text: str) -> str:
+        path = os.path.join(self.directory.name, filename)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_csv(self):
+        filename = self.write("contacts.csv",
+                              "Name,Phones,Email,Birthday,Address\n"
+                              "John,0501234567; 0671234567,john@example.com,01.02.1990,Kyiv\n"
+                              "Jane,0931234567,,,\n")
+        report = import_contacts(self.book, filename, workers=1)
+
+        self.assertEqual((report.imported, report.errors), (2, []))
+        john = self.book.find("John")
+        self.assertEqual([phone.value for phone in john.phones], ["0501234567", "0671234567"])
+        self.assertEqual(john.emails[0].value, "john@example.com")
+        self.assertEqual(john.birthday.stringify_date(), "01.02.1990")
+        self.assertEqual(john.address.value, "Kyiv")
+        self.assertIsNone(self.book.find("Jane").birthday)
+
+    def test_vcard(self):
+        filename = self.write("contacts.vcf",
+                              "BEGIN:VCARD\r\nVERSION:3.0\r\nFN:John\r\n"
+                              "TEL;TYPE=CELL:0501234567\r\nBDAY:1990-02-01\r\n"
+                              "ADR:;;Main street\\, 1;Kyiv;;;\r\n"
+                              "NOTE:long line\r\n  folded\r\nEND:VCARD\r\n")
+        report = import_contacts(self.book, filename, workers=1)
+
+        self.assertEqual(report.imported, 1)
+        john = self.book.find("John")
+        self.assertEqual(john.phones[0].value, "0501234567")
+        self.assertEqual(john.birthday.stringify_date(), "01.02.1990")
+        self.assertEqual(john.address.value, "Main street, 1, Kyiv")
+
+    def test_rejected_rows_are_reported(self):
+        self.book.unique_keys = True
+        self.book.add("Jim")
+        filename = self.write("contacts.csv",
+                              "name,phone,birthday\n"
+                              "John,0501234567,\n"
+                              ",0671234567,\n"
+                              "Jane,123,\n"
+                              "Ann,0931234567,31.02.1990\n"
+                              "Jim,0631234567,\n"
+                              "Joe,0501234567,\n")
+        report = import_contacts(self.book, filename, workers=1)
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5, 6, 7])
+        self.assertEqual(report.errors[0][1], "Name cannot be blank")
+        self.assertIn("Jim already exists", report.errors[3][1])
+        self.assertIsNone(self.book.find("Joe"))
+
+    def test_batches_in_worker_processes(self):
+        rows = "".join(f"Contact {number},050{number:07d}\n" for number in range(50))
+        filename = self.write("contacts.csv", "name,phone\n" + rows + ",\n")
+        report = import_contacts(self.book, filename, batch_size=8, workers=2)
+
+        self.assertEqual((report.imported, report.errors), (50, [(52, "Name cannot be blank")]))
+        self.assertEqual(self.book.find("Contact 42").phones[0].value, "0500000042")
+
+    def test_write_errors(self):
+        report = ImportReport()
+        report.errors.append((3, "Wrong phone format 123"))
+        filename = os.path.join(self.directory.name, "errors.csv")
+        report.write_errors(filename)
+
+        with open(filename, encoding="utf-8") as f:
+            self.assertEqual(f.read().splitlines(), ["line,error", "3,Wrong phone format 123"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from indexes import FuzzyIndex
+
+
+class FuzzyIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = FuzzyIndex()
+        for name in ["John", "Joan", "Jonathan", "Jim", "Alice", "Bo"]:
+            self.index.update("put", name, None)
+
+    def names(self, query: str) -> list[str]:
+        return [name for _, name in self.index.search(query)]
+
+    def test_short_typo(self):
+        self.assertEqual(self.names("Jhn"), ["John"])
+        self.assertIn("John", self.names("Jon"))
+        self.assertEqual(self.names("Bi"), ["Bo"])
+
+    def test_short_prefix(self):
+        self.assertIn("Jonathan", self.names("Jon"))
+        self.assertEqual(self.names("ji"), ["Jim"])
+
+    def test_longer_typos(self):
+        self.assertEqual(self.index.search("Alise"), [(1, "Alice")])
+        self.assertEqual(self.index.search("Jonahtan"), [(2, "Jonathan")])
+
+    def test_removed_names(self):
+        self.index.update("delete", "John", None)
+        self.assertEqual(self.names("Jhn"), [])
+        self.assertNotIn("John", self.names("Jon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+from instrumentation import Stats
+
+
+class Store:
+    def find(self, name):
+        return name.upper()
+
+    @staticmethod
+    def normalize(name):
+        return name.strip()
+
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.stats = Stats()
+
+    def test_report(self):
+        for millis in range(1, 101):
+            self.stats.record("book.find", millis / 1000, 2)
+
+        report = self.stats.report()["book.find"]
+        self.assertEqual((report["count"], report["p50_ms"], report["p95_ms"], report["p99_ms"], report["max_ms"]),
+                         (100, 51.0, 96.0, 100.0, 100.0))
+        self.assertEqual((report["total_ms"], report["alloc_blocks"]), (5050.0, 2.0))
+
+    def test_measure_counts_failed_calls(self):
+        with self.assertRaises(KeyError):
+            with self.stats.measure("book.delete"):
+                raise KeyError("John")
+        self.assertEqual(self.stats.report()["book.delete"]["count"], 1)
+
+    def test_instrument_class(self):
+        cls = type("InstrumentedStore", (Store,), {})
+        self.stats.instrument_class(cls, "book", ["find", "normalize", "missing"])
+        # instrumenting twice does not measure a call twice
+        self.stats.instrument_class(cls, "book", ["find", "normalize"])
+
+        store = cls()
+        self.assertEqual(store.find("john"), "JOHN")
+        self.assertEqual(cls.normalize(" john "), "john")
+        self.assertEqual({name: metric["count"] for name, metric in self.stats.report().items()},
+                         {"book.find": 1, "book.normalize": 1})
+
+    def test_dump(self):
+        self.stats.record("state.save", 0.5, 0)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "stats.json")
+            self.stats.dump(filename)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["state.save"]["max_ms"], 500.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from storage import JournalStorage
+
+
+class JournalStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # first loads report the missing files
+        self.stderr = self.enterContext(redirect_stderr(io.StringIO()))
+        self.book_file = os.path.join(self.directory.name, "addressbook.pkl")
+        self.notes_file = os.path.join(self.directory.name, "notes.pkl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def storage(self, compact_every: int = 10_000) -> JournalStorage:
+        return JournalStorage(book_file=self.book_file, notes_file=self.notes_file, compact_every=compact_every)
+
+    def test_round_trip(self):
+        storage = self.storage()
+        book = storage.load_book()
+        notes = storage.load_notes()
+        book.add("John").add_phone("0501234567")
+        notes.add_note("Shopping", "milk", ["home"])
+        storage.save_book(book)
+        storage.save_notes(notes)
+        storage.close()
+
+        storage = self.storage()
+        with redirect_stderr(io.StringIO()) as stderr:
+            book = storage.load_book()
+            notes = storage.load_notes()
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertEqual(book.find("John").phones[0].value, "0501234567")
+        self.assertEqual(notes.find_note_by_title("shopping").tags, ["home"])
+
+    def test_replays_changes_after_snapshot(self):
+        storage = self.storage()
+        book = storage.load_book()
+        book.add("John")
+        storage.save_book(book)
+        # not saved: the journal already has the changes when the process dies
+        book.find("John").add_phone("0501234567")
+        book.add("Jane")
+        book.delete("John")
+        storage.close()
+
+        book = self.storage().load_book()
+        self.assertEqual([record.name.value for record in book.values()], ["Jane"])
+
+    def test_torn_entry_is_cut_off(self):
+        storage = self.storage()
+        book = storage.load_book()
+        book.add("John")
+        storage.save_book(book)
+        book.add("Jane")
+        storage.close()
+
+        journal = f"{self.book_file}.journal"
+        size = os.path.getsize(journal)
+        with open(journal, "ab") as f:
+            f.write(b"\x80\x05\x95\x10")
+
+        with redirect_stderr(io.StringIO()):
+            book = self.storage().load_book()
+        self.assertEqual(sorted(record.name.value for record in book.values()), ["Jane", "John"])
+        self.assertEqual(os.path.getsize(journal), size)
+
+    def test_compacts_long_journal(self):
+        storage = self.storage(compact_every=5)
+        book = storage.load_book()
+        for number in range(12):
+            book.add(f"Contact {number}")
+            storage.save_book(book)
+        storage.close()
+
+        self.assertLess(storage.book_journal.entries, 5)
+        self.assertEqual(len(self.storage(compact_every=5).load_book()), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
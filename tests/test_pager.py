@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+
+from addressbook import AddressBook
+from interface.pager import page_through
+from interface.prompt_script import prompt_script
+
+
+class PagerTest(unittest.TestCase):
+    def setUp(self):
+        self.book = AddressBook()
+        for number in range(25):
+            self.book.add(f"Contact {number:02d}")
+        self.fetched = []
+        self.drawn = []
+
+    def fetch(self, start: int, count: int) -> list:
+        self.fetched.append((start, count))
+        return [record.name.value for record in self.book.records_page(start, count)]
+
+    def draw(self, rows: list, footer: str | None) -> None:
+        self.drawn.append((rows[0], rows[-1], footer))
+
+    def test_records_page(self):
+        self.assertEqual([record.name.value for record in self.book.records_page(20, 10)],
+                         [f"Contact {number}" for number in range(20, 25)])
+        self.assertEqual(self.book.records_page(30, 10), [])
+
+    def test_keys_move_between_pages(self):
+        keys = ["next", "next", "next", "previous", "first", "last", "quit"]
+        with mock.patch("interface.pager.prompt_page", side_effect=keys) as prompt_page:
+            page_through(len(self.book), 10, self.fetch, self.draw)
+
+        self.assertEqual([call.args for call in prompt_page.call_args_list],
+                         [(1, 3), (2, 3), (3, 3), (3, 3), (2, 3), (1, 3), (3, 3)])
+        self.assertEqual(self.fetched, [(0, 10), (10, 10), (20, 10), (20, 10), (10, 10), (0, 10), (20, 10)])
+        self.assertEqual(self.drawn[2], ("Contact 20", "Contact 24", "21-25 of 25"))
+
+    def test_single_page_and_scripts_get_everything(self):
+        with mock.patch("interface.pager.prompt_page") as prompt_page:
+            page_through(len(self.book), 50, self.fetch, self.draw)
+            prompt_script.start([])
+            try:
+                page_through(len(self.book), 10, self.fetch, self.draw)
+            finally:
+                prompt_script.finish()
+
+        prompt_page.assert_not_called()
+        self.assertEqual(self.fetched, [(0, 25), (0, 25)])
+        self.assertEqual(self.drawn, [("Contact 00", "Contact 24", None)] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
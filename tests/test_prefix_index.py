@@ -0,0 +1,37 @@
+import unittest
+
+from notes import NotesManager
+
+
+class NotesCompletionTest(unittest.TestCase):
+    def setUp(self):
+        self.notes = NotesManager()
+        self.note = self.notes.add_note("Shopping", "milk", ["home"])
+        # builds the index before the changes below
+        self.assertEqual(self.notes.complete_words("sho"), ["Shopping"])
+
+    def test_rename_then_edit(self):
+        self.notes.edit_note(self.note, "Groceries", "milk", ["home"])
+        self.notes.edit_note(self.note, "Groceries", "eggs", ["kitchen"])
+        self.assertEqual(self.notes.complete_words("sho"), [])
+        self.assertEqual(self.notes.complete_words("gro"), ["Groceries"])
+        self.assertEqual(self.notes.complete_words("home"), [])
+        self.assertEqual(self.notes.complete_words("kit"), ["kitchen"])
+
+    def test_rename_then_delete(self):
+        self.notes.edit_note(self.note, "Groceries", "milk", ["home"])
+        self.notes.remove_note(self.note)
+        self.assertEqual(self.notes.complete_words("gro"), [])
+        self.assertEqual(self.notes.complete_words("home"), [])
+        self.assertEqual(self.notes.get_autocomplete_words(), [])
+
+    def test_old_title_reused(self):
+        self.notes.edit_note(self.note, "Groceries", "milk", ["home"])
+        self.notes.add_note("Shopping", "bread", ["shop"])
+        self.assertEqual(self.notes.complete_words("gro"), ["Groceries"])
+        self.assertEqual(self.notes.complete_words("home"), ["home"])
+        self.assertEqual(self.notes.complete_words("sho"), ["shop", "Shopping"])
+
+
+if __name__ == "__main__":
+    unittest.main()
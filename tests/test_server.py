@@ -0,0 +1,83 @@
+import asyncio
+import time
+import unittest
+
+from addressbook import AddressBook
+from app_state import AppState
+from notes import NotesManager
+from server import AppServer
+from storage import PickleStorage
+
+
+class SlowStorage(PickleStorage):
+    """
+    Saves slowly and remembers whether a read ran meanwhile
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.saving = False
+        self.overlapped = False
+
+    def save_book(self, book: AddressBook) -> None:
+        self.saving = True
+        time.sleep(0.05)
+        self.saving = False
+        book.mark_saved(book.changes)
+
+    def save_notes(self, notes: NotesManager) -> None:
+        notes.mark_saved(notes.changes)
+
+
+class WatchedBook(AddressBook):
+    storage: SlowStorage
+
+    def values(self):
+        self.storage.overlapped |= self.storage.saving
+        time.sleep(0.005)
+        self.storage.overlapped |= self.storage.saving
+        return super().values()
+
+
+class AppServerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.storage = SlowStorage()
+        book = WatchedBook()
+        book.storage = self.storage
+        book.add("John")
+        self.state = AppState(notes=NotesManager(), book=book, storage=self.storage)
+        self.server = AppServer(self.state)
+
+    async def asyncSetUp(self):
+        self.server.loop = asyncio.get_running_loop()
+
+    async def get(self, target: str) -> tuple[int, object]:
+        return await self.server.dispatch("GET", target, b"")
+
+    async def test_reads_wait_for_autosave(self):
+        for number in range(3):
+            self.state.book.add(f"Contact {number}")
+            saves = [asyncio.to_thread(self.server.save_from_thread) for _ in range(3)]
+            reads = [self.get("/contacts") for _ in range(30)]
+            results = await asyncio.gather(*saves, *reads)
+            self.assertTrue(all(status == 200 for status, _ in results[len(saves):]))
+        self.assertFalse(self.storage.overlapped)
+        self.assertFalse(self.state.book.dirty)
+
+    async def test_negative_paging(self):
+        self.assertEqual((await self.get("/contacts?offset=-1"))[0], 400)
+        self.assertEqual((await self.get("/contacts?limit=-5"))[0], 400)
+        self.assertEqual((await self.get("/notes?q=x&offset=-1"))[0], 400)
+
+    async def test_note_search_pages(self):
+        for title in ("alpha one", "alpha two", "alpha three"):
+            self.state.notes.add_note(title, "alpha")
+        status, first = await self.get("/notes?q=alpha&limit=2")
+        status, rest = await self.get("/notes?q=alpha&offset=2&limit=2")
+        self.assertEqual(status, 200)
+        titles = [note["title"] for note in first["notes"] + rest["notes"]]
+        self.assertEqual(sorted(titles), ["alpha one", "alpha three", "alpha two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from addressbook import AddressBook
+from storage import ShardedStorage
+from storage.sharded_book import shard_of
+
+
+class ShardedStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.shards_dir = os.path.join(self.directory.name, "addressbook.shards")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def storage(self, shards: int = 4) -> ShardedStorage:
+        return ShardedStorage(book_file=self.shards_dir,
+                              pickle_book_file=os.path.join(self.directory.name, "addressbook.pkl"),
+                              notes_file=os.path.join(self.directory.name, "notes.pkl"),
+                              shards=shards)
+
+    def fill(self, book: AddressBook, count: int = 20) -> None:
+        for number in range(count):
+            book.add(f"Contact {number}").add_phone(f"050{number:07d}")
+
+    def test_round_trip(self):
+        storage = self.storage()
+        book = storage.load_book()
+        self.fill(book)
+        storage.save_book(book)
+
+        book = self.storage().load_book()
+        self.assertEqual(len(book), 20)
+        self.assertEqual(book.find("Contact 7").phones[0].value, "0500000007")
+        self.assertEqual([record.name.value for record in book.find_by_phone("0500000013")], ["Contact 13"])
+
+    def test_only_changed_shards_are_saved(self):
+        storage = self.storage()
+        book = storage.load_book()
+        self.fill(book)
+        storage.save_book(book)
+
+        book = self.storage().load_book()
+        book.find("Contact 3").add_phone("0679999999")
+        self.assertEqual(book.data.dirty, {shard_of("Contact 3", 4)})
+
+    def test_reshard(self):
+        storage = self.storage()
+        book = storage.load_book()
+        self.fill(book)
+        storage.save_book(book)
+
+        storage = self.storage(shards=2)
+        book = storage.load_book()
+        storage.save_book(book)
+        self.assertEqual(sorted(os.listdir(self.shards_dir)), ["000.pkl", "001.pkl", "manifest.json"])
+        self.assertEqual(len(self.storage(shards=2).load_book()), 20)
+
+    def test_imports_pickled_book(self):
+        book = AddressBook()
+        self.fill(book, 5)
+        book.save(os.path.join(self.directory.name, "addressbook.pkl"))
+
+        self.assertEqual(len(self.storage().load_book()), 5)
+
+    def test_damaged_shard_is_kept_aside(self):
+        storage = self.storage()
+        book = storage.load_book()
+        self.fill(book)
+        storage.save_book(book)
+
+        shard = shard_of("Contact 1", 4)
+        filename = os.path.join(self.shards_dir, f"{shard:03d}.pkl")
+        with open(filename, "rb") as f:
+            damaged = f.read()[:-10]
+        with open(filename, "wb") as f:
+            f.write(damaged)
+
+        storage = self.storage()
+        with redirect_stderr(io.StringIO()) as stderr:
+            book = storage.load_book()
+        self.assertIn("is damaged", stderr.getvalue())
+        self.assertIsNone(book.find("Contact 1"))
+        self.assertEqual(len(book), 20 - sum(shard_of(f"Contact {n}", 4) == shard for n in range(20)))
+
+        # rewriting the shard does not lose what was in the damaged file
+        book.add("Contact 1")
+        storage.save_book(book)
+        with open(f"{filename}.damaged", "rb") as f:
+            self.assertEqual(f.read(), damaged)
+
+
+if __name__ == "__main__":
+    unittest.main()
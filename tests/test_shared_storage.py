@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from storage import SharedStorage
+
+
+class SharedStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # first loads report the missing files
+        self.stderr = self.enterContext(redirect_stderr(io.StringIO()))
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.close()
+        self.directory.cleanup()
+
+    def storage(self, compact_every: int = 10_000) -> SharedStorage:
+        """
+        Storage of one bot process, several of them share the same files
+        """
+        storage = SharedStorage(book_file=os.path.join(self.directory.name, "addressbook.pkl"),
+                                notes_file=os.path.join(self.directory.name, "notes.pkl"),
+                                compact_every=compact_every)
+        self.storages.append(storage)
+        return storage
+
+    def test_round_trip(self):
+        storage = self.storage()
+        book = storage.load_book()
+        notes = storage.load_notes()
+        book.add("John").add_phone("0501234567")
+        notes.add_note("Shopping", "milk", ["home"])
+        storage.save_book(book)
+        storage.save_notes(notes)
+
+        storage = self.storage()
+        with redirect_stderr(io.StringIO()) as stderr:
+            book = storage.load_book()
+            notes = storage.load_notes()
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertEqual(book.find("John").phones[0].value, "0501234567")
+        self.assertEqual(notes.find_note_by_title("shopping").content, "milk")
+
+    def test_merges_changes_of_other_processes(self):
+        first, second = self.storage(), self.storage()
+        first_book, second_book = first.load_book(), second.load_book()
+
+        first_book.add("John")
+        second_book.add("Jane")
+        first.save_book(first_book)
+        second.save_book(second_book)
+        first.save_book(first_book)
+
+        for book in (first_book, second_book, self.storage().load_book()):
+            self.assertEqual(sorted(record.name.value for record in book.values()), ["Jane", "John"])
+
+    def test_later_save_wins(self):
+        first = self.storage()
+        book = first.load_book()
+        book.add("John")
+        first.save_book(book)
+
+        second = self.storage()
+        first_book, second_book = book, second.load_book()
+        first_book.find("John").add_phone("0501111111")
+        second_book.find("John").add_phone("0502222222")
+        first.save_book(first_book)
+        second.save_book(second_book)
+
+        phones = [phone.value for phone in self.storage().load_book().find("John").phones]
+        self.assertEqual(phones, ["0502222222"])
+
+    def test_rename_is_merged_as_delete_and_put(self):
+        first = self.storage()
+        notes = first.load_notes()
+        notes.add_note("Plan", "draft")
+        first.save_notes(notes)
+
+        second = self.storage()
+        first_notes, second_notes = notes, second.load_notes()
+        first_notes.edit_note(first_notes.find_note_by_title("plan"), "Final plan", "draft", [])
+        second_notes.find_note_by_title("plan").update_content("edited")
+        first.save_notes(first_notes)
+        second.save_notes(second_notes)
+        first.save_notes(first_notes)
+
+        titles = [sorted(note.title for note in store.notes)
+                  for store in (first_notes, second_notes, self.storage().load_notes())]
+        self.assertEqual(titles, [["Final plan", "Plan"]] * 3)
+
+    def test_catches_up_after_compaction(self):
+        first, second = self.storage(compact_every=3), self.storage(compact_every=3)
+        first_book, second_book = first.load_book(), second.load_book()
+        for number in range(5):
+            first_book.add(f"Contact {number}")
+            first.save_book(first_book)
+        second_book.add("Jane")
+        second.save_book(second_book)
+
+        self.assertEqual(len(second_book), 6)
+        self.assertEqual(len(self.storage(compact_every=3).load_book()), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,49 @@
-from typing import Optional, Callable, cast
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.validation import Validator
+import sys
+from typing import TYPE_CHECKING, Optional, Callable, cast
 
+from interface.prompt_script import prompt_script
 from addressbook import (DateFormatError, EmailFormatError, NameFormatError,
                          PhoneFormatError, Record, RangeFormatError)
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import Completer
+
+def prompt_error(message: str) -> None:
+    """
+    Prints the error next to the prompt, on stderr when stdout is piped
+    """
+    print(message, file=sys.stdout if sys.stdout.isatty() else sys.stderr)
+
 # Validete input
 
 def validated_prompt(
         label: str,
         validator: Optional[Callable[[str], None]] = None,
-        completer: Optional[WordCompleter] = None,
+        completer: Optional["Completer"] = None,
         optional: bool = False,
 ) -> Callable[..., str]:
     def wrapper(
             *,
-            session: PromptSession | None = None,
+            session: Optional["PromptSession"] = None,
             label: str = label,
             validator=validator,
             live_validator=None,
             completer=completer,
     ):
+        if prompt_script.active:
+            value = prompt_script.answer(label, optional).strip()
+            if validator and (value or not optional):
+                validator(value)
+            return value
+
         if session is None:
+            # prompt_toolkit is only imported once something is prompted
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.validation import Validator
+
+            from interface.prompt_helper import prompt_output
+
             session = PromptSession(
                 completer=completer,
                 validator=(
@@ -31,6 +51,7 @@ def validated_prompt(
                     if not live_validator
                     else Validator.from_callable(live_validator)
                 ),
+                output=prompt_output(),
             )
 
         while True:
@@ -44,22 +65,31 @@ def validated_prompt(
             except KeyboardInterrupt:
                 raise
             except RangeFormatError as e:
-                print(f"[!] {e.message}")
+                prompt_error(f"[!] {e.message}")
             except NameFormatError:
-                print("[!] Name cannot be blank")
+                prompt_error("[!] Name cannot be blank")
             except PhoneFormatError:
-                print("[!] Wrong phone format.")
+                prompt_error("[!] Wrong phone format.")
             except EmailFormatError:
-                print("[!] Wrong email format.")
+                prompt_error("[!] Wrong email format.")
             except DateFormatError:
-                print("[!] Invalid date format. Use DD.MM.YYYY.")
+                prompt_error("[!] Invalid date format. Use DD.MM.YYYY.")
             except EOFError:
                 raise
             except Exception:
-                print("[!] Invalid input. Try again.")
+                prompt_error("[!] Invalid input. Try again.")
 
     return cast(Callable[..., str], wrapper)
 
+def ask(message: str, optional: bool = False) -> str:
+    """
+    Plain `input` that takes the answer from the batch script when one runs,
+    a missing answer fails the command unless it is optional
+    """
+    if prompt_script.active:
+        return prompt_script.answer(message, optional)
+    return input(message)
+
 # Input functions
 
 get_birthday_range = validated_prompt(
@@ -83,3 +113,7 @@ get_old_email = validated_prompt("Enter old email", validator=Record.validate_em
 get_new_email = validated_prompt("Enter new email", validator=Record.validate_email)
 
 get_term = validated_prompt("Enter search term")
+
+get_path = validated_prompt("Enter file path")
+
+get_tag = validated_prompt("Enter the tag to search for")